@@ -0,0 +1,71 @@
+import streamlit as st
+import pandas as pd
+
+from utils import acceso, cache
+
+# Configuración de la página
+st.set_page_config(
+    page_title="Administración de caché",
+    page_icon="📦",
+    layout="wide"
+)
+
+st.title("Administración de caché")
+
+st.markdown("""
+Estado de la caché compartida de resultados (filtros, resúmenes, consultas SQL y exportaciones).
+La caché tiene un límite de memoria con expulsión LRU y una caducidad por entrada.
+Opcionalmente, las entradas ligadas a un archivo de datos también se guardan en disco.
+""")
+
+cache_consultas = cache.obtener_cache()
+
+estadisticas = pd.DataFrame(cache_consultas.estadisticas())
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Memoria usada", f"{cache_consultas.bytes_usados / 1024 / 1024:.2f} MB")
+col2.metric("Límite", f"{cache_consultas.max_bytes / 1024 / 1024:.0f} MB")
+col3.metric("Caducidad", f"{cache_consultas.ttl / 60:.0f} min")
+# Resultados que no se guardaron por superar el límite completo
+col4.metric("Rechazadas por tamaño", int(estadisticas["rechazadas"].sum()) if not estadisticas.empty else 0)
+
+st.header("Espacios")
+if estadisticas.empty:
+    st.info("La caché todavía no se ha usado.")
+else:
+    st.dataframe(estadisticas, use_container_width=True, hide_index=True)
+
+st.header("Entradas")
+entradas = pd.DataFrame(cache_consultas.entradas())
+if entradas.empty:
+    st.info("No hay entradas vigentes.")
+else:
+    st.dataframe(entradas, use_container_width=True, hide_index=True)
+
+st.header("Nivel en disco")
+if cache_consultas.disco is None:
+    st.info("El nivel en disco está desactivado. Define la variable de entorno `NTP_CACHE_DISCO` con un directorio para activarlo.")
+else:
+    disco = cache_consultas.disco
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Directorio", disco.directorio)
+    col2.metric("Aciertos en disco", disco.aciertos)
+    col3.metric("Fallos en disco", disco.fallos)
+    estadisticas_disco = pd.DataFrame(disco.estadisticas())
+    if estadisticas_disco.empty:
+        st.info("No hay entradas en disco.")
+    else:
+        st.dataframe(estadisticas_disco, use_container_width=True, hide_index=True)
+
+st.header("Vaciar")
+col1, col2 = st.columns([1, 3])
+
+with col1:
+    # Vaciar afecta a todos los usuarios (y al nivel en disco): solo el docente puede hacerlo
+    if acceso.es_docente("clave_cache", "el vaciado de la caché"):
+        espacio = st.selectbox("Espacio", ["(todos)"] + cache_consultas.espacios())
+        if st.button("🗑️ Vaciar caché"):
+            cache_consultas.vaciar(None if espacio == "(todos)" else espacio)
+            if espacio == "(todos)":
+                st.cache_data.clear()
+            st.rerun()
@@ -0,0 +1,51 @@
+import streamlit as st
+
+from utils import acceso, registro
+
+# Configuración de la página
+st.set_page_config(
+    page_title="Telemetría",
+    page_icon="📈",
+    layout="wide"
+)
+
+st.title("Telemetría de rendimiento")
+
+st.markdown("""
+Cada ejecución de las páginas instrumentadas queda registrada con su duración, los widgets
+que cambiaron y las filas devueltas. Los registros recientes están en segmentos JSONL;
+la compactación los junta en archivos Parquet.
+""")
+
+col1, col2 = st.columns([1, 3])
+with col1:
+    # Compactar reescribe los archivos del registro de todos los usuarios: solo el docente
+    if acceso.es_docente("clave_telemetria", "la compactación") and st.button("🗜️ Compactar segmentos"):
+        compactados = registro.compactar()
+        st.success(f"Registros compactados: {compactados}")
+
+interacciones = registro.cargar_interacciones()
+
+if interacciones is None or interacciones.empty:
+    st.info("Todavía no hay interacciones registradas.")
+else:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Ejecuciones", len(interacciones))
+    col2.metric("Sesiones", interacciones["sesion"].nunique())
+    col3.metric("p90 global", f"{interacciones['duracion_ms'].quantile(0.9):.0f} ms")
+
+    st.header("Latencia por página")
+    st.dataframe(registro.percentiles_por_pagina(interacciones).round(1), use_container_width=True)
+
+    st.header("Widgets que más ejecuciones provocan")
+    widgets = interacciones["widgets"].str.split(",").explode()
+    widgets = widgets[widgets.notna() & (widgets != "")]
+    if widgets.empty:
+        st.info("No hay cambios de widgets registrados.")
+    else:
+        st.bar_chart(widgets.value_counts().head(15))
+
+    st.header("Duración en el tiempo")
+    pagina = st.selectbox("Página", sorted(interacciones["pagina"].unique()))
+    serie = interacciones[interacciones["pagina"] == pagina].set_index("fecha")["duracion_ms"].sort_index()
+    st.line_chart(serie)
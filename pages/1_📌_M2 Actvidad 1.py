@@ -1,9 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import sqlite3
-import json
-import os
+
+from utils import cache, catalogo, fuentes, registro
 
 # Configuración de la página
 st.set_page_config(
@@ -12,8 +11,33 @@ st.set_page_config(
     layout="wide"
 )
 
+medicion = registro.iniciar("m2_actividad1")
+
 st.title("Momento 2 - Actividad 1")
 
+url_csv = "https://raw.githubusercontent.com/plotly/datasets/master/iris.csv"
+
+# Lanzar la carga de las fuentes externas en paralelo; cada sección espera su resultado.
+# Los resultados quedan en la caché compartida, validados con la versión del archivo.
+ESPACIO_CACHE = "m2_actividad1"
+cache_consultas = cache.obtener_cache()
+
+futuro_csv = cache_consultas.obtener_futuro(
+    ESPACIO_CACHE, "exportaciones", fuentes.cargar_exportaciones, version=catalogo.version("exportaciones")
+)
+futuro_excel = cache_consultas.obtener_futuro(
+    ESPACIO_CACHE, "economia", fuentes.cargar_economia, version=catalogo.version("economia")
+)
+futuro_json = cache_consultas.obtener_futuro(
+    ESPACIO_CACHE, "patrimonio", fuentes.cargar_patrimonio, version=catalogo.version("patrimonio")
+)
+futuro_sql = cache_consultas.obtener_futuro(
+    ESPACIO_CACHE, "colegios", fuentes.cargar_colegios, version=catalogo.version("colegios")
+)
+futuro_url = cache_consultas.obtener_futuro(
+    ESPACIO_CACHE, ("url", url_csv), fuentes.cargar_url, url_csv, hilo=True
+)
+
 # Descripción de la actividad
 st.header("Descripción de la actividad")
 st.markdown("""
@@ -108,16 +132,7 @@ st.dataframe(df_demografia)
 st.subheader("5. Desde CSV - Exportaciones colombianas")
 st.markdown("Leemos datos desde un archivo CSV.")
 
-# Crear archivo CSV de ejemplo si no existe
-if not os.path.exists("exportaciones.csv"):
-    datos_export = {
-        "Producto": ["Café", "Petróleo", "Flores", "Banano"],
-        "Valor (USD millones)": [2850, 12500, 1500, 850],
-        "Destino principal": ["EE.UU.", "EE.UU.", "EE.UU.", "Europa"]
-    }
-    pd.DataFrame(datos_export).to_csv("exportaciones.csv", index=False)
-
-df_csv = pd.read_csv("exportaciones.csv")
+df_csv = futuro_csv.result()
 st.dataframe(df_csv)
 
 # --------------------------------------------------
@@ -126,16 +141,7 @@ st.dataframe(df_csv)
 st.subheader("6. Desde Excel - Indicadores económicos")
 st.markdown("Leemos datos desde un archivo Excel.")
 
-# Crear archivo Excel de ejemplo si no existe
-if not os.path.exists("economia.xlsx"):
-    datos_econ = {
-        "Año": [2019, 2020, 2021],
-        "PIB (billones COP)": [1100, 990, 1150],
-        "Inflación (%)": [3.5, 2.5, 5.0]
-    }
-    pd.DataFrame(datos_econ).to_excel("economia.xlsx", index=False)
-
-df_excel = pd.read_excel("economia.xlsx")
+df_excel = futuro_excel.result()
 st.dataframe(df_excel)
 
 # --------------------------------------------------
@@ -144,16 +150,7 @@ st.dataframe(df_excel)
 st.subheader("7. Desde JSON - Patrimonio cultural")
 st.markdown("Leemos datos desde un archivo JSON.")
 
-# Crear archivo JSON de ejemplo si no existe
-if not os.path.exists("patrimonio.json"):
-    patrimonio = [
-        {"Nombre": "Carnaval de Barranquilla", "Tipo": "Inmaterial", "Año declaración": 2003},
-        {"Nombre": "Parque Arqueológico de San Agustín", "Tipo": "Material", "Año declaración": 1995}
-    ]
-    with open("patrimonio.json", "w") as f:
-        json.dump(patrimonio, f)
-
-df_json = pd.read_json("patrimonio.json")
+df_json = futuro_json.result()
 st.dataframe(df_json)
 
 # --------------------------------------------------
@@ -162,9 +159,8 @@ st.dataframe(df_json)
 st.subheader("8. Desde URL - Datos públicos")
 st.markdown("Leemos datos directamente desde una URL.")
 
-url_csv = "https://raw.githubusercontent.com/plotly/datasets/master/iris.csv"
 try:
-    df_url = pd.read_csv(url_csv)
+    df_url = futuro_url.result()
     st.dataframe(df_url.head()) # Mostramos solo las primeras filas
 except Exception as e:
     st.error(f"Error al leer el CSV desde la URL: {e}")
@@ -175,34 +171,8 @@ except Exception as e:
 st.subheader("9. Desde SQLite - Datos educativos")
 st.markdown("Conectamos a una base de datos SQLite y consultamos datos.")
 
-# Configurar base de datos SQLite
-conn = sqlite3.connect("educacion.db")
-cursor = conn.cursor()
-
-# Crear tabla si no existe
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS colegios (
-    id INTEGER PRIMARY KEY,
-    nombre TEXT,
-    estudiantes INTEGER,
-    municipio TEXT
-)
-""")
-
-# Insertar datos de ejemplo si la tabla está vacía
-if cursor.execute("SELECT COUNT(*) FROM colegios").fetchone()[0] == 0:
-    datos_colegios = [
-        (1, "Liceo Nacional", 1200, "Bogotá"),
-        (2, "INEM", 950, "Cali"),
-        (3, "Normal Superior", 800, "Medellín")
-    ]
-    cursor.executemany("INSERT INTO colegios VALUES (?, ?, ?, ?)", datos_colegios)
-    conn.commit()
-
-# Consultar y mostrar datos
-df_sql = pd.read_sql("SELECT nombre, estudiantes, municipio FROM colegios", conn)
+df_sql = futuro_sql.result()
 st.dataframe(df_sql)
-conn.close()
 
 # --------------------------------------------------
 # 10. DataFrame desde NumPy (Datos aleatorios)
@@ -226,4 +196,6 @@ st.markdown("""
 - Todos los ejemplos utilizan datos relacionados con Colombia
 - Los archivos necesarios se generan automáticamente
 - La visualización es interactiva gracias a Streamlit
-""")
\ No newline at end of file
+""")
+
+medicion.finalizar(filas=sum(len(df) for df in [df_csv, df_excel, df_json, df_sql]))
\ No newline at end of file
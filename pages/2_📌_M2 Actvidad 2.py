@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 from io import StringIO
 import os
 
+from utils import cache, catalogo, estadisticas, registro, tablas
+
 
 # Configuración de la página
 st.set_page_config(
@@ -11,6 +12,8 @@ st.set_page_config(
     layout="wide"
 )
 
+medicion = registro.iniciar("m2_actividad2")
+
 st.title("Momento 2 - Actividad 2")
 
 st.header("Descripción de la actividad")
@@ -60,12 +63,16 @@ st.info("💡 **Nota metodológica**: Los datos utilizados son anónimos y repre
 
 st.header("Solución")
 
-@st.cache_data
+# Espacio de esta página en la caché compartida
+ESPACIO_CACHE = "m2_actividad2"
+cache_consultas = cache.obtener_cache()
+
 def load_data():
     try:
-        ruta_relativa = "static/datasets/estudiantes_colombia.csv"
+        ruta_relativa = catalogo.ruta("estudiantes")
 
-        data = pd.read_csv(ruta_relativa)
+        # Cada vista lee solo las columnas que necesita; si el CSV cambia se vuelven a leer
+        data = tablas.obtener_tabla("estudiantes")
         return data
 
     except FileNotFoundError as e:
@@ -76,19 +83,40 @@ def load_data():
         st.error(f"❌ Error inesperado al cargar los datos: {str(e)}")
         return None
 
-df = load_data()
-
-if df is not None:
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "🔍 Vista General", 
-        "📋 Resumen Estadístico", 
-        "🎯 Selección Columnas", 
-        "📈 Filtros Avanzados"
-    ])
+tabla = load_data()
+
+def calcular_resumen(df):
+    buffer = StringIO()
+    df.info(buf=buffer)
+    return {"info": buffer.getvalue(), "describe": estadisticas.describir(df)}
+
+if tabla is not None:
+    version_datos = tabla.version
+    total_filas = catalogo.filas("estudiantes")
+    filas_devueltas = total_filas
+
+    # Solo se ejecuta la sección elegida (las pestañas ejecutan todas en cada interacción),
+    # así las secciones que usan pocas columnas no cargan el dataset completo
+    st.caption(f"Dataset: {total_filas} filas y {len(tabla.esquema)} columnas")
+    seccion = st.radio(
+        "Sección",
+        [
+            "🔍 Vista General",
+            "📋 Resumen Estadístico",
+            "🎯 Selección Columnas",
+            "📈 Filtros Avanzados"
+        ],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="seccion"
+    )
     
-    with tab1:
+    if seccion == "🔍 Vista General":
         st.header("Vista General del Dataset")
         
+        # La vista general muestra todas las columnas
+        df = tabla.columnas()
+        
         col1, col2 = st.columns(2)
         
         with col1:
@@ -102,69 +130,105 @@ if df is not None:
         st.subheader("Dimensión del Dataset")
         st.write(f"El dataset contiene {df.shape[0]} filas y {df.shape[1]} columnas")
     
-    with tab2:
+    elif seccion == "📋 Resumen Estadístico":
         st.header("Resumen Estadístico")
         
+        # .info() y .describe() necesitan todas las columnas; el resultado queda en caché
+        resumen = cache_consultas.obtener(
+            ESPACIO_CACHE, "resumen", lambda: calcular_resumen(tabla.columnas()), version=version_datos
+        )
+
         with st.expander("🔎 Información del Dataset (.info())", expanded=True):
-            buffer = StringIO()
-            df.info(buf=buffer)
-            st.text(buffer.getvalue())
+            st.text(resumen["info"])
         
         st.subheader("Estadísticas Descriptivas (.describe())")
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(resumen["describe"], use_container_width=True)
         
-        # Mostrar tipos de datos
+        # Mostrar tipos de datos (del catálogo, sin cargar el dataset)
         st.subheader("Tipos de Datos")
-        st.write(df.dtypes)
+        st.write(catalogo.esquema("estudiantes"))
     
-    with tab3:
+    elif seccion == "🎯 Selección Columnas":
         st.header("Selección de Columnas Específicas")
         
         selected_columns = st.multiselect(
             "Selecciona las columnas que deseas visualizar:",
-            options=sorted(df.columns),
-            default=["nombre", "edad", "promedio"] if all(col in df.columns for col in ["nombre", "edad", "promedio"]) else []
+            options=sorted(tabla.esquema),
+            default=["nombre", "edad", "promedio"] if all(col in tabla.esquema for col in ["nombre", "edad", "promedio"]) else [],
+            key="columnas_seleccionadas"
         )
         
         if selected_columns:
-            st.dataframe(df[selected_columns], use_container_width=True)
+            df_seleccion = tabla.columnas(selected_columns)
+            # El catálogo conoce el tamaño sin cargar los datos: paginar si es grande
+            if catalogo.debe_paginar("estudiantes"):
+                tamano_pagina = catalogo.LIMITE_FILAS_COMPLETO
+                total_paginas = (total_filas - 1) // tamano_pagina + 1
+                pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, key="pagina_columnas")
+                inicio = (pagina - 1) * tamano_pagina
+                st.dataframe(df_seleccion.iloc[inicio:inicio + tamano_pagina], use_container_width=True)
+                st.caption(f"Página {pagina} de {total_paginas}")
+            else:
+                st.dataframe(df_seleccion, use_container_width=True)
         else:
             st.warning("Por favor selecciona al menos una columna para visualizar")
     
-    with tab4:
+    elif seccion == "📈 Filtros Avanzados":
         st.header("Filtros Avanzados")
         
-        if "promedio" in df.columns:
+        if "promedio" in tabla.esquema:
+            # Los filtros solo necesitan promedio y edad
+            df_filtros = tabla.columnas(["promedio", "edad"])
             col1, col2 = st.columns([1, 3])
             
             with col1:
                 min_score = st.slider(
                     "Promedio mínimo:",
-                    min_value=float(df["promedio"].min()),
-                    max_value=float(df["promedio"].max()),
-                    value=float(df["promedio"].mean()),
-                    step=0.5
+                    min_value=float(df_filtros["promedio"].min()),
+                    max_value=float(df_filtros["promedio"].max()),
+                    value=float(df_filtros["promedio"].mean()),
+                    step=0.5,
+                    key="promedio_minimo"
                 )
 
                 age_range = st.slider(
                     "Rango de edad:",
-                    min_value=int(df["edad"].min()),
-                    max_value=int(df["edad"].max()),
-                    value=(int(df["edad"].min()), int(df["edad"].max()))
+                    min_value=int(df_filtros["edad"].min()),
+                    max_value=int(df_filtros["edad"].max()),
+                    value=(int(df_filtros["edad"].min()), int(df_filtros["edad"].max())),
+                    key="rango_edad"
+                )
+
+                # El resultado y la exportación llevan todas las columnas, salvo que se quiten algunas
+                columnas_filtro = st.multiselect(
+                    "Columnas del resultado:",
+                    options=tabla.esquema,
+                    default=tabla.esquema,
+                    key="columnas_filtro"
                 )
             
             with col2:
-                filtered_df = df[
-                    (df["promedio"] >= min_score) &
-                    (df["edad"] >= age_range[0]) & 
-                    (df["edad"] <= age_range[1])
-                ]
+                clave_filtro = (version_datos, min_score, tuple(age_range), tuple(columnas_filtro))
+                filtered_df = cache_consultas.obtener(
+                    ESPACIO_CACHE,
+                    ("filtro",) + clave_filtro,
+                    lambda: tabla.columnas(columnas_filtro)[
+                        (df_filtros["promedio"] >= min_score) &
+                        (df_filtros["edad"] >= age_range[0]) & 
+                        (df_filtros["edad"] <= age_range[1])
+                    ]
+                )
                 
+                filas_devueltas = len(filtered_df)
                 st.metric("Estudiantes filtrados", len(filtered_df))
                 st.dataframe(filtered_df, use_container_width=True)
                 
-                if len(filtered_df) > 0:
-                    csv = filtered_df.to_csv(index=False).encode('utf-8')
+                if len(filtered_df) > 0 and columnas_filtro:
+                    csv = cache_consultas.obtener(
+                        ESPACIO_CACHE,
+                        ("exportacion",) + clave_filtro,
+                        lambda: filtered_df.to_csv(index=False).encode('utf-8')
+                    )
                     st.download_button(
                         label="📥 Descargar datos filtrados",
                         data=csv,
@@ -174,5 +238,8 @@ if df is not None:
         else:
             st.warning("No se encontró la columna 'promedio' en el dataset")
 
+    medicion.finalizar(filas=filas_devueltas)
+
 else:
-    st.info("Por favor corrige los errores mencionados arriba para continuar")
\ No newline at end of file
+    st.info("Por favor corrige los errores mencionados arriba para continuar")
+    medicion.finalizar(filas=0)
\ No newline at end of file
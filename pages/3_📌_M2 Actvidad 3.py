@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from faker import Faker # type: ignore
-import random
+import os
+
+from utils import cache, instantanea, perfilador, poblacion, registro, tablas, temporal
 
 # Configuración de la página
 st.set_page_config(   
@@ -10,6 +11,8 @@ st.set_page_config(
     layout="wide"
 )
 
+medicion = registro.iniciar("m2_actividad3")
+
 st.title("Momento 2 - Actividad 3")
 
 st.header("Descripción de la actividad")
@@ -34,134 +37,203 @@ st.markdown("[📎 Ir al google colab de Esneyder](https://colab.research.google
 
 st.header("Solución")
 
-# Configurar Faker para Colombia
-fake = Faker('es_CO')
-
-# Establecer semilla para reproducibilidad
-np.random.seed(123)
-random.seed(123)
-fake.seed_instance(123)
-
-# Crear datos
 n = 50
-data = {
-    'id': range(1, n + 1),
-    'nombre_completo': [fake.name() for _ in range(n)],
-    'edad': np.random.randint(15, 76, n),
-    'region': random.choices(
-        ['Caribe', 'Andina', 'Pacífica', 'Orinoquía', 'Amazonía'],
-        weights=[0.3, 0.4, 0.15, 0.1, 0.05],
-        k=n
-    ),
-    'municipio': random.choices(
-        [
-            'Barranquilla', 'Santa Marta', 'Cartagena',  # Caribe
-            'Bogotá', 'Medellín', 'Tunja', 'Manizales',  # Andina
-            'Cali', 'Quibdó', 'Buenaventura',           # Pacífica
-            'Villavicencio', 'Yopal',                    # Orinoquía
-            'Leticia', 'Puerto Inírida'                  # Amazonía
-        ],
-        k=n
-    ),
-    'ingreso_mensual': np.random.randint(800000, 12000001, n),
-    'ocupacion': random.choices(
-        [
-            'Estudiante', 'Docente', 'Comerciante', 'Agricultor',
-            'Ingeniero', 'Médico', 'Desempleado', 'Pensionado',
-            'Emprendedor', 'Obrero'
-        ],
-        k=n
-    ),
-    'tipo_vivienda': random.choices(
-        ['Propia', 'Arrendada', 'Familiar'],
-        k=n
-    ),
-    'fecha_nacimiento': [
-        fake.date_of_birth(minimum_age=15, maximum_age=75) for _ in range(n)
-    ],
-    'acceso_internet': random.choices([True, False], weights=[0.7, 0.3], k=n)
-}
-
-# Crear DataFrame
-df_nuevo = pd.DataFrame(data)
-
-# Introducir algunos valores nulos
-df_nuevo.loc[3:5, 'ingreso_mensual'] = np.nan
-df_nuevo.loc[15:17, 'ocupacion'] = np.nan
-
-# Convertir fecha_nacimiento a datetime
-df_nuevo['fecha_nacimiento'] = pd.to_datetime(df_nuevo['fecha_nacimiento'])
+semilla = 123
+
+def leer_poblacion(columnas=None):
+    # Crear datos: se generan una sola vez y luego se leen de una instantánea Parquet
+    df = instantanea.poblacion(n, semilla=semilla, columnas=columnas)
+
+    # Introducir algunos valores nulos (la instantánea guarda el ingreso como entero)
+    if 'ingreso_mensual' in df:
+        df['ingreso_mensual'] = df['ingreso_mensual'].astype('float64')
+        df.loc[3:5, 'ingreso_mensual'] = np.nan
+    if 'ocupacion' in df:
+        df.loc[15:17, 'ocupacion'] = np.nan
+    return df
+
+# Las columnas se leen de la instantánea solo cuando un filtro o la vista las piden
+ruta_poblacion = instantanea.asegurar_poblacion(n, semilla)
+version_poblacion = f"{os.path.basename(ruta_poblacion)}-nulos"
+tabla_poblacion = tablas.TablaProyectada(
+    f"poblacion_n{n}_s{semilla}", version_poblacion, instantanea.esquema(ruta_poblacion), leer_poblacion
+)
+
+def obtener_indice_temporal():
+    # Días desde 1970 con su índice ordenado; solo depende de los datos
+    def construir():
+        fechas = temporal.agregar_columnas_temporales(tabla_poblacion.columnas(['fecha_nacimiento']))
+        return temporal.IndiceTemporal(fechas)
+
+    return cache.obtener_cache().obtener(
+        "m2_actividad3", "indice_temporal", construir,
+        version=version_poblacion
+    )
+
+def obtener_indice_edad():
+    # Los grupos de edad se forman con la misma columna 'edad' que muestra la tabla
+    return cache.obtener_cache().obtener(
+        "m2_actividad3", "indice_edad",
+        lambda: temporal.IndiceEdad(tabla_poblacion.columnas(['edad'])['edad'].to_numpy()),
+        version=version_poblacion
+    )
+
+# Lanzar el perfil de calidad en segundo plano; lee la instantánea allí mismo,
+# así el perfil cubre las columnas de la tabla y no las derivadas de los índices
+futuro_perfil = perfilador.perfil_en_segundo_plano(leer_poblacion, "m2_actividad3", version=version_poblacion)
 
 # solucion
 st.sidebar.title("Filtros dinámicos")
 
-df_filtrado = df_nuevo.copy()
+# Primero se leen los filtros activos; después se cargan solo las columnas que usan
+filtros = {}
 
 # 1. Filtro por rango de edad
-if st.sidebar.checkbox("Filtrar por rango de edad"):
-    min_edad, max_edad = st.sidebar.slider("Selecciona el rango de edad", 15, 75, (20, 60))
-    df_filtrado = df_filtrado[df_filtrado['edad'].between(min_edad, max_edad)]
+if st.sidebar.checkbox("Filtrar por rango de edad", key="filtro_edad"):
+    filtros["edad"] = st.sidebar.slider("Selecciona el rango de edad", 15, 75, (20, 60), key="rango_edad")
 
 # 2. Filtro por municipios específicos
-if st.sidebar.checkbox("Filtrar por municipios"):
-    municipios_opciones = [
-        'Barranquilla', 'Santa Marta', 'Cartagena', 'Bogotá', 'Medellín',
-        'Tunja', 'Manizales', 'Cali', 'Quibdó', 'Buenaventura',
-        'Villavicencio', 'Yopal', 'Leticia', 'Puerto Inírida'
-    ]
-    municipios_seleccionados = st.sidebar.multiselect("Selecciona municipios", municipios_opciones)
+if st.sidebar.checkbox("Filtrar por municipios", key="filtro_municipios"):
+    municipios_seleccionados = st.sidebar.multiselect("Selecciona municipios", poblacion.MUNICIPIOS, key="municipios")
     if municipios_seleccionados:
-        df_filtrado = df_filtrado[df_filtrado['municipio'].isin(municipios_seleccionados)]
+        filtros["municipios"] = municipios_seleccionados
 
 # 3. Filtro por ingreso mensual mínimo
-if st.sidebar.checkbox("Filtrar por ingreso mensual mínimo"):
-    ingreso_minimo = st.sidebar.slider("Ingreso mensual mínimo", 800000, 12000000, 2000000, step=100000)
-    df_filtrado = df_filtrado[df_filtrado['ingreso_mensual'] > ingreso_minimo]
+if st.sidebar.checkbox("Filtrar por ingreso mensual mínimo", key="filtro_ingreso"):
+    filtros["ingreso_minimo"] = st.sidebar.slider("Ingreso mensual mínimo", 800000, 12000000, 2000000, step=100000, key="ingreso_minimo")
 
 # 4. Filtro por ocupación
-if st.sidebar.checkbox("Filtrar por ocupación"):
-    ocupaciones_opciones = [
-        'Estudiante', 'Docente', 'Comerciante', 'Agricultor',
-        'Ingeniero', 'Médico', 'Desempleado', 'Pensionado',
-        'Emprendedor', 'Obrero'
-    ]
-    ocupaciones_seleccionadas = st.sidebar.multiselect("Selecciona ocupaciones", ocupaciones_opciones)
+if st.sidebar.checkbox("Filtrar por ocupación", key="filtro_ocupacion"):
+    ocupaciones_seleccionadas = st.sidebar.multiselect("Selecciona ocupaciones", poblacion.OCUPACIONES, key="ocupaciones")
     if ocupaciones_seleccionadas:
-        df_filtrado = df_filtrado[df_filtrado['ocupacion'].isin(ocupaciones_seleccionadas)]
+        filtros["ocupacion"] = ocupaciones_seleccionadas
 
 # 5. Filtro por tipo de vivienda no propia
-if st.sidebar.checkbox("Filtrar personas sin vivienda propia"):
-    df_filtrado = df_filtrado[~(df_filtrado['tipo_vivienda'] == 'Propia')]
+if st.sidebar.checkbox("Filtrar personas sin vivienda propia", key="filtro_vivienda"):
+    filtros["vivienda"] = True
 
 # 6. Filtro por nombres que contienen una cadena
-if st.sidebar.checkbox("Filtrar por nombre"):
-    texto_nombre = st.sidebar.text_input("Ingresa parte del nombre a buscar")
+if st.sidebar.checkbox("Filtrar por nombre", key="filtro_nombre"):
+    texto_nombre = st.sidebar.text_input("Ingresa parte del nombre a buscar", key="texto_nombre")
     if texto_nombre:
-        df_filtrado = df_filtrado[df_filtrado['nombre_completo'].str.contains(texto_nombre, case=False, na=False)]
+        filtros["nombre"] = texto_nombre
 
 # 7. Filtro por año de nacimiento específico
-if st.sidebar.checkbox("Filtrar por año de nacimiento"):
+if st.sidebar.checkbox("Filtrar por año de nacimiento", key="filtro_anio"):
     años = list(range(1949, 2010))  # 2024 - 75 hasta 2024 - 15
-    año_nacimiento = st.sidebar.selectbox("Selecciona el año de nacimiento", años)
-    df_filtrado = df_filtrado[df_filtrado['fecha_nacimiento'].dt.year == año_nacimiento]
+    filtros["anio_nacimiento"] = st.sidebar.selectbox("Selecciona el año de nacimiento", años, key="anio_nacimiento")
 
 # 8. Filtro por acceso a internet
-if st.sidebar.checkbox("Filtrar por acceso a internet"):
-    acceso = st.sidebar.radio("¿Tiene acceso a internet?", ["Sí", "No"])
-    df_filtrado = df_filtrado[df_filtrado['acceso_internet'] == (acceso == "Sí")]
+if st.sidebar.checkbox("Filtrar por acceso a internet", key="filtro_internet"):
+    acceso = st.sidebar.radio("¿Tiene acceso a internet?", ["Sí", "No"], key="acceso_internet")
+    filtros["internet"] = acceso == "Sí"
 
 # 9. Filtro por ingresos nulos
-if st.sidebar.checkbox("Filtrar por ingresos nulos"):
-    df_filtrado = df_filtrado[df_filtrado['ingreso_mensual'].isnull()]
+if st.sidebar.checkbox("Filtrar por ingresos nulos", key="filtro_ingresos_nulos"):
+    filtros["ingresos_nulos"] = True
 
 # 10. Filtro por rango de fechas de nacimiento
-if st.sidebar.checkbox("Filtrar por rango de fechas de nacimiento"):
-    fecha_inicio = st.sidebar.date_input("Fecha de nacimiento inicial", value=pd.to_datetime("1949-01-01"))
-    fecha_fin = st.sidebar.date_input("Fecha de nacimiento final", value=pd.to_datetime("2009-12-31"))
+if st.sidebar.checkbox("Filtrar por rango de fechas de nacimiento", key="filtro_fechas"):
+    fecha_inicio = st.sidebar.date_input("Fecha de nacimiento inicial", value=pd.to_datetime("1949-01-01"), key="fecha_inicio")
+    fecha_fin = st.sidebar.date_input("Fecha de nacimiento final", value=pd.to_datetime("2009-12-31"), key="fecha_fin")
     if fecha_inicio <= fecha_fin:
-        df_filtrado = df_filtrado[df_filtrado['fecha_nacimiento'].between(fecha_inicio, fecha_fin)]
+        filtros["rango_fechas"] = (fecha_inicio, fecha_fin)
+
+# 11. Filtro por grupo de edad
+if st.sidebar.checkbox("Filtrar por grupo de edad", key="filtro_grupo_edad"):
+    grupos_seleccionados = st.sidebar.multiselect("Selecciona grupos de edad", list(temporal.GRUPOS_EDAD), key="grupos_edad")
+    if grupos_seleccionados:
+        filtros["grupo_edad"] = grupos_seleccionados
 
-# Mostrar resultados
 st.subheader("Datos filtrados")
+columnas_visibles = st.multiselect(
+    "Columnas a mostrar", tabla_poblacion.esquema, default=tabla_poblacion.esquema, key="columnas_visibles"
+)
+
+# Leer solo las columnas que usan los filtros activos y las que se muestran
+columnas = instantanea.columnas_para_filtros(filtros)
+columnas += [columna for columna in columnas_visibles if columna not in columnas]
+
+# La tabla se comparte entre sesiones; los filtros crean DataFrames nuevos y nunca la modifican
+df_filtrado = tabla_poblacion.columnas(columnas)
+
+def filtrar_con_mascara(df, mascara):
+    # Las máscaras de los índices cubren todas las filas de la población; se toman las que quedan
+    return df[mascara[df.index.to_numpy()]]
+
+if "edad" in filtros:
+    min_edad, max_edad = filtros["edad"]
+    df_filtrado = df_filtrado[df_filtrado['edad'].between(min_edad, max_edad)]
+
+if "municipios" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['municipio'].isin(filtros["municipios"])]
+
+if "ingreso_minimo" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['ingreso_mensual'] > filtros["ingreso_minimo"]]
+
+if "ocupacion" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['ocupacion'].isin(filtros["ocupacion"])]
+
+if "vivienda" in filtros:
+    df_filtrado = df_filtrado[~(df_filtrado['tipo_vivienda'] == 'Propia')]
+
+if "nombre" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['nombre_completo'].str.contains(filtros["nombre"], case=False, na=False)]
+
+if "anio_nacimiento" in filtros:
+    df_filtrado = filtrar_con_mascara(df_filtrado, obtener_indice_temporal().mascara_anio(filtros["anio_nacimiento"]))
+
+if "internet" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['acceso_internet'] == filtros["internet"]]
+
+if "ingresos_nulos" in filtros:
+    df_filtrado = df_filtrado[df_filtrado['ingreso_mensual'].isnull()]
+
+if "rango_fechas" in filtros:
+    df_filtrado = filtrar_con_mascara(df_filtrado, obtener_indice_temporal().mascara_fechas(*filtros["rango_fechas"]))
+
+if "grupo_edad" in filtros:
+    df_filtrado = filtrar_con_mascara(df_filtrado, obtener_indice_edad().mascara_grupos(filtros["grupo_edad"]))
+
+# Mostrar resultados
 st.write(f"Total de registros: {len(df_filtrado)}")
-st.dataframe(df_filtrado)
+st.dataframe(df_filtrado[columnas_visibles])
+medicion.finalizar(filas=len(df_filtrado))
+
+# Calidad de datos
+def panel_calidad():
+    error = futuro_perfil.exception()
+    if error is not None:
+        # Un perfil fallido no queda en caché: la próxima ejecución lo intenta de nuevo
+        st.error(f"No se pudo calcular el perfil de calidad de datos: {error}")
+        return
+    perfil = futuro_perfil.result()
+    columnas = perfil["columnas"]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Registros", perfil["filas"])
+    col2.metric("Columnas con nulos", int((columnas["nulos"] > 0).sum()))
+    col3.metric("Valores nulos", int(columnas["nulos"].sum()))
+
+    st.dataframe(columnas, use_container_width=True)
+
+    con_histograma = [columna for columna, datos in perfil["histogramas"].items() if datos is not None]
+    if con_histograma:
+        columna = st.selectbox("Histograma de la columna", con_histograma)
+        datos = perfil["histogramas"][columna]
+        inicio_intervalo = np.round(datos["bordes"][:-1], 2)
+        st.bar_chart(pd.DataFrame({"registros": datos["conteos"]}, index=inicio_intervalo))
+
+@st.fragment(run_every=1)
+def esperar_perfil():
+    # Mientras el perfil se calcula, solo este fragmento se vuelve a ejecutar cada segundo
+    if futuro_perfil.done():
+        # Volver a ejecutar la página completa: el panel se muestra sin sondeo
+        st.rerun()
+    st.info("⏳ Calculando el perfil de calidad de datos...")
+
+st.subheader("Calidad de datos")
+if futuro_perfil.done():
+    panel_calidad()
+else:
+    esperar_perfil()
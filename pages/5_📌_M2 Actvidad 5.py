@@ -1,29 +1,4 @@
-import streamlit as st
-
-# Configuración de la página
-st.set_page_config(   
-    page_icon="📌",
-    layout="wide"
-)
-
-st.title("Momento 2 - Actividad 5")
-
-st.header("Descripción de la actividad")
-st.markdown("""
-Esta actividad es una introducción práctica a Python y a las estructuras de datos básicas.
-En ella, exploraremos los conceptos fundamentales de Python y aprenderemos a utilizar variables,
-tipos de datos, operadores, y las estructuras de datos más utilizadas como listas, tuplas,
-diccionarios y conjuntos.
-""")
-
-st.header("Objetivos de aprendizaje")
-
-st.markdown("""
-- Comprender los tipos de datos básicos en Python
-- Aprender a utilizar variables y operadores
-- Dominar las estructuras de datos fundamentales
-- Aplicar estos conocimientos en ejemplos prácticos
-""")
-
-st.header("Solución")
+from utils import plantillas
 
+# El contenido de esta página está en contenido/actividades.json
+plantillas.renderizar("m2_actividad5")
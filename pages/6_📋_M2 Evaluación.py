@@ -1,3 +1,4 @@
-import streamlit as st
+from utils import plantillas
 
-st.title("Momento 2 - Evaluación")
\ No newline at end of file
+# El contenido de esta página está en contenido/actividades.json
+plantillas.renderizar("m2_evaluacion")
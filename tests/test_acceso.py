@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINA_CACHE = str(RAIZ / "pages" / "13_📦_Caché.py")
+PAGINA_TELEMETRIA = str(RAIZ / "pages" / "14_📈_Telemetría.py")
+
+
+@pytest.fixture(autouse=True)
+def en_raiz(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+
+
+def test_vaciar_cache_sin_clave_configurada(monkeypatch):
+    monkeypatch.delenv("NTP_CLAVE_DOCENTE", raising=False)
+    app = AppTest.from_file(PAGINA_CACHE).run()
+    assert not app.exception
+    assert not app.button
+
+
+def test_vaciar_cache_requiere_clave(monkeypatch):
+    monkeypatch.setenv("NTP_CLAVE_DOCENTE", "secreta")
+    app = AppTest.from_file(PAGINA_CACHE).run()
+    app.text_input(key="clave_cache").set_value("otra").run()
+    assert not app.button
+
+    app.text_input(key="clave_cache").set_value("secreta").run()
+    assert not app.exception
+    assert [boton.label for boton in app.button] == ["🗑️ Vaciar caché"]
+
+
+def test_compactar_registro_requiere_clave(monkeypatch):
+    monkeypatch.setenv("NTP_CLAVE_DOCENTE", "secreta")
+    app = AppTest.from_file(PAGINA_TELEMETRIA).run()
+    assert not app.exception
+    assert not app.button
+
+    app.text_input(key="clave_telemetria").set_value("secreta").run()
+    assert [boton.label for boton in app.button] == ["🗜️ Compactar segmentos"]
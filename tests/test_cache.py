@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from utils import cache
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj manual para la caducidad de las entradas."""
+    ahora = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: ahora[0])
+    return ahora
+
+
+def test_expulsa_la_entrada_usada_hace_mas_tiempo():
+    consultas = cache.CacheConsultas(max_bytes=300, ttl=60)
+    for clave in "abc":
+        consultas.guardar("p", clave, b"x" * 100)
+
+    # Usar "a" la deja como la más reciente: la siguiente en salir es "b"
+    assert consultas.buscar("p", "a") == (True, b"x" * 100)
+    consultas.guardar("p", "d", b"x" * 100)
+
+    assert [entrada["clave"] for entrada in consultas.entradas()] == ["'c'", "'a'", "'d'"]
+    assert consultas.buscar("p", "b") == (False, None)
+    assert consultas.bytes_usados == 300
+
+
+def test_caducidad(reloj):
+    consultas = cache.CacheConsultas(max_bytes=1000, ttl=10)
+    consultas.guardar("p", "corta", "valor", ttl=1)
+    consultas.guardar("p", "larga", "valor")
+
+    reloj[0] += 5
+    assert consultas.buscar("p", "corta") == (False, None)
+    assert consultas.buscar("p", "larga") == (True, "valor")
+
+    reloj[0] += 10
+    assert consultas.buscar("p", "larga") == (False, None)
+    assert consultas.bytes_usados == 0
+
+
+def test_contabilidad_de_bytes():
+    consultas = cache.CacheConsultas(max_bytes=1 << 20, ttl=60)
+    consultas.guardar("p", "arreglo", np.zeros(1000))
+    consultas.guardar("p", "tupla", (b"x" * 10, "y" * 20))
+    assert consultas.bytes_usados == 8000 + 30
+
+    # Reemplazar una entrada descuenta el tamaño anterior
+    consultas.guardar("p", "tupla", b"x")
+    assert consultas.bytes_usados == 8000 + 1
+
+    consultas.vaciar("p")
+    assert consultas.bytes_usados == 0
+
+
+def test_tamano_de_objetos_sin_serializar():
+    class Resultado:
+        def __init__(self):
+            self.valores = np.zeros(500)
+            self.propio = self
+
+    # El arreglo domina; la referencia circular no se cuenta dos veces
+    tamano = cache.tamano_en_bytes(Resultado())
+    assert 4000 < tamano < 5000
+
+
+def test_contadores_por_espacio(reloj):
+    consultas = cache.CacheConsultas(max_bytes=100, ttl=10)
+    consultas.guardar("a", 1, b"x" * 60)
+    consultas.buscar("a", 1)
+    consultas.buscar("a", 2)
+    consultas.guardar("b", 1, b"x" * 60)
+    consultas.guardar("b", 2, b"x" * 500)
+    consultas.guardar("b", 3, "v", ttl=1)
+    reloj[0] += 2
+    consultas.buscar("b", 3)
+
+    estadisticas = {fila["espacio"]: fila for fila in consultas.estadisticas()}
+    assert {k: estadisticas["a"][k] for k in ("aciertos", "fallos", "expulsiones", "rechazadas")} == \
+        {"aciertos": 1, "fallos": 1, "expulsiones": 1, "rechazadas": 0}
+    assert {k: estadisticas["b"][k] for k in ("entradas", "caducadas", "fallos", "rechazadas")} == \
+        {"entradas": 1, "caducadas": 1, "fallos": 1, "rechazadas": 1}
+    assert estadisticas["a"]["tasa_aciertos"] == 0.5
@@ -0,0 +1,78 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from utils import cache_disco
+
+
+@pytest.fixture
+def disco(tmp_path):
+    return cache_disco.CacheDisco(str(tmp_path), max_bytes=1 << 20)
+
+
+def _archivo(disco, espacio, clave, formato):
+    return disco._ruta(cache_disco._llave(espacio, clave), formato)
+
+
+def test_ida_y_vuelta_arrow_y_pickle(disco):
+    df = pd.DataFrame({"edad": [20, 31], "nombre": ["Ana", "Luis"]}, index=[5, 7])
+    resumen = {"media": 25.5, "grupos": ("18-24", "25-34")}
+    disco.guardar("p", "df", df, "h1")
+    disco.guardar("p", "resumen", resumen, "h1")
+
+    assert os.path.exists(_archivo(disco, "p", "df", "arrow"))
+    encontrado, leido = disco.buscar("p", "df", "h1")
+    assert encontrado
+    pd.testing.assert_frame_equal(leido, df)
+    assert disco.buscar("p", "resumen", "h1") == (True, resumen)
+
+
+def test_cambio_de_hash_invalida_la_entrada(disco):
+    disco.guardar("p", "resumen", [1, 2, 3], "h1")
+
+    assert disco.buscar("p", "resumen", "h2") == (False, None)
+    # La entrada se borró: ni el hash anterior la recupera
+    assert disco.buscar("p", "resumen", "h1") == (False, None)
+    assert not os.path.exists(_archivo(disco, "p", "resumen", "pickle"))
+
+
+class Resumen:
+    pass
+
+
+def test_entrada_ilegible_se_descarta(disco, monkeypatch):
+    disco.guardar("p", "vieja", Resumen(), "h1")
+    disco.guardar("p", "otra_version", [1], "h1")
+
+    # Si la clase guardada ya no existe, pickle lanza AttributeError
+    monkeypatch.delitem(globals(), "Resumen")
+    with open(_archivo(disco, "p", "otra_version", "pickle"), "wb") as archivo:
+        pickle.dump((cache_disco.VERSION_PICKLE + 1, [1]), archivo)
+
+    assert disco.buscar("p", "vieja", "h1") == (False, None)
+    assert disco.buscar("p", "otra_version", "h1") == (False, None)
+    assert disco.estadisticas() == []
+
+
+def test_recortar_elimina_las_menos_usadas(tmp_path, monkeypatch):
+    disco = cache_disco.CacheDisco(str(tmp_path))
+    reloj = [1000.0]
+    monkeypatch.setattr(cache_disco.time, "time", lambda: reloj[0])
+
+    for clave in "abc":
+        reloj[0] += 1
+        disco.guardar("p", clave, b"x" * 1000, "h")
+    reloj[0] += 1
+    disco.buscar("p", "a", "h")
+
+    # Con espacio para dos entradas, se va "b": la usada hace más tiempo
+    tamano = os.path.getsize(_archivo(disco, "p", "a", "pickle"))
+    disco.max_bytes = 2 * tamano
+    with disco._conectar() as conn:
+        disco._recortar(conn)
+
+    assert disco.estadisticas() == [{"espacio": "p", "entradas": 2, "bytes": 2 * tamano}]
+    assert disco.buscar("p", "b", "h") == (False, None)
+    assert disco.buscar("p", "a", "h")[0] and disco.buscar("p", "c", "h")[0]
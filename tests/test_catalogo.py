@@ -0,0 +1,133 @@
+import sqlite3
+
+import pytest
+
+from utils import catalogo
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """Dos datasets en la misma base SQLite, en modo WAL como las entregas."""
+    ruta = str(tmp_path / "compartida.db")
+    conn = sqlite3.connect(ruta)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE colegios (id INTEGER PRIMARY KEY, nombre TEXT)")
+    conn.execute("CREATE TABLE entregas (clave TEXT PRIMARY KEY, puntaje REAL)")
+    conn.execute("INSERT INTO colegios VALUES (1, 'INEM')")
+    conn.commit()
+
+    monkeypatch.setattr(catalogo, "_manifiesto", {
+        "colegios": {"ruta": ruta, "formato": "sqlite", "tabla": "colegios"},
+        "entregas": {"ruta": ruta, "formato": "sqlite", "tabla": "entregas"},
+    })
+    monkeypatch.setattr(catalogo, "_memo", {})
+    yield conn
+    conn.close()
+
+
+def test_version_sqlite_depende_solo_de_su_tabla(base):
+    colegios = catalogo.version("colegios")
+    entregas = catalogo.version("entregas")
+
+    # La conexión sigue abierta: el cambio queda en el -wal, sin checkpoint
+    base.execute("INSERT INTO entregas VALUES ('a', 4.5)")
+    base.commit()
+
+    assert catalogo.version("colegios") == colegios
+    assert catalogo.version("entregas") != entregas
+    assert catalogo.filas("entregas") == 1
+
+
+@pytest.fixture
+def registrar(monkeypatch):
+    """Registra datasets de prueba en un manifiesto temporal."""
+    manifiesto = {}
+    monkeypatch.setattr(catalogo, "_manifiesto", manifiesto)
+    monkeypatch.setattr(catalogo, "_memo", {})
+
+    def _registrar(nombre, ruta, formato, **extra):
+        manifiesto[nombre] = {"ruta": str(ruta), "formato": formato, **extra}
+        return nombre
+
+    return _registrar
+
+
+ESQUEMA_COMUN = {"id": "entero", "nota": "decimal", "aprobado": "booleano", "nombre": "texto"}
+
+
+def _tabla():
+    import pandas as pd
+
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "nota": [4.5, 3.0, 2.5],
+        "aprobado": [True, True, False],
+        "nombre": ["Ana", "Luis", "Eva"],
+    })
+
+
+def test_csv_cuenta_registros_con_saltos_entre_comillas(tmp_path, registrar):
+    ruta = tmp_path / "datos.csv"
+    ruta.write_text('id,nota,aprobado,nombre\n1,4.5,True,"Ana\nMaría"\n2,3.0,True,Luis\n3,2.5,False,"Eva"', encoding="utf-8")
+    nombre = registrar("datos", ruta, "csv")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_csv_sin_comillas(tmp_path, registrar):
+    ruta = tmp_path / "datos.csv"
+    _tabla().to_csv(ruta, index=False)
+    nombre = registrar("datos", ruta, "csv")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_excel(tmp_path, registrar):
+    ruta = tmp_path / "datos.xlsx"
+    _tabla().to_excel(ruta, index=False)
+    nombre = registrar("datos", ruta, "excel")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_json(tmp_path, registrar):
+    ruta = tmp_path / "datos.json"
+    _tabla().to_json(ruta, orient="records")
+    nombre = registrar("datos", ruta, "json")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_sqlite(tmp_path, registrar):
+    ruta = tmp_path / "datos.db"
+    conn = sqlite3.connect(ruta)
+    conn.execute("CREATE TABLE datos (id INTEGER, nota REAL, aprobado BOOLEAN, nombre VARCHAR(40))")
+    conn.executemany("INSERT INTO datos VALUES (?, ?, ?, ?)", _tabla().itertuples(index=False))
+    conn.commit()
+    conn.close()
+    nombre = registrar("datos", ruta, "sqlite", tabla="datos")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_parquet(tmp_path, registrar):
+    ruta = tmp_path / "datos.parquet"
+    _tabla().to_parquet(ruta, index=False)
+    nombre = registrar("datos", ruta, "parquet")
+
+    assert catalogo.filas(nombre) == 3
+    assert catalogo.esquema(nombre) == ESQUEMA_COMUN
+
+
+def test_metadatos_sin_campo_cache(tmp_path, registrar):
+    ruta = tmp_path / "datos.csv"
+    _tabla().to_csv(ruta, index=False)
+    nombre = registrar("datos", ruta, "csv")
+
+    assert "cache" not in catalogo.metadatos(nombre)
+    assert set(catalogo.esquema(nombre).values()) <= set(catalogo.TIPOS)
@@ -0,0 +1,53 @@
+import os
+import sys
+import types
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import ejecutor
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def en_raiz(monkeypatch):
+    # Las páginas leen sus archivos con rutas relativas a la raíz del proyecto
+    monkeypatch.chdir(RAIZ)
+
+
+def test_actividad1_con_pool_de_procesos():
+    # Dos ejecuciones: la segunda reutiliza el pool creado por la primera
+    for _ in range(2):
+        app = AppTest.from_file(str(RAIZ / "pages" / "1_📌_M2 Actvidad 1.py"), default_timeout=120)
+        app.run()
+        assert not app.exception
+        assert app.dataframe
+
+
+def test_pool_roto_se_reemplaza():
+    with pytest.raises(BrokenProcessPool):
+        ejecutor.enviar(os._exit, 1).result(timeout=60)
+    assert ejecutor.enviar(abs, -3).result(timeout=60) == 3
+
+
+
+def test_envios_no_inician_trabajadores(monkeypatch, tmp_path):
+    ejecutor.apagar()
+    pool = ejecutor.obtener_pool_procesos()
+    # Todos los trabajadores arrancan al crear el pool
+    assert len(pool._processes) == ejecutor.MAX_TRABAJADORES
+
+    # Una "página" como __main__ que haría fallar a cualquier trabajador iniciado después
+    pagina = tmp_path / "pagina.py"
+    pagina.write_text("raise SystemExit(3)\n")
+    bomba = types.ModuleType("__main__")
+    bomba.__file__ = str(pagina)
+    monkeypatch.setitem(sys.modules, "__main__", bomba)
+
+    assert ejecutor.mapear(abs, [(-i,) for i in range(50)]) == list(range(50))
+    assert ejecutor.obtener_pool_procesos() is pool
+    assert len(pool._processes) == ejecutor.MAX_TRABAJADORES
+    assert sys.modules["__main__"] is bomba
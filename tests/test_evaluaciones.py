@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import cache, catalogo, evaluaciones
+
+
+@pytest.fixture
+def cola(tmp_path, monkeypatch):
+    """Cola de entregas propia sobre una base temporal."""
+    monkeypatch.setattr(catalogo, "_manifiesto", {
+        "entregas": {"ruta": str(tmp_path / "entregas.db"), "formato": "sqlite", "tabla": "entregas"},
+    })
+    monkeypatch.setattr(catalogo, "_memo", {})
+    cola = evaluaciones.ColaEntregas()
+    yield cola
+    cola.cerrar()
+
+
+def _entrega(clave):
+    return {
+        "clave": f"clave-{clave}",
+        "momento": "momento2" if clave % 2 else "momento3",
+        "estudiante": f"Estudiante {clave}",
+        "respuestas": {"p1": "a"},
+        "puntaje": round(clave % 11 * 0.5, 2),
+        "fecha": "2026-01-01 08:00:00",
+    }
+
+
+def test_entregas_concurrentes_por_lotes(cola, monkeypatch):
+    lotes = []
+    escribir = cola._escribir
+
+    def espiar(lote):
+        lotes.append(len(lote))
+        return escribir(lote)
+
+    monkeypatch.setattr(cola, "_escribir", espiar)
+
+    # 300 envíos sobre 120 claves: cada formulario se reenvía hasta tres veces
+    claves = [i % 120 for i in range(300)]
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        futuros = list(pool.map(lambda clave: cola.enviar(_entrega(clave)), claves))
+    nuevas = [futuro.result(timeout=30) for futuro in futuros]
+
+    assert sum(nuevas) == 120
+    assert sum(lotes) == 300 and len(lotes) < 300
+
+    conn = evaluaciones._conectar()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM entregas").fetchone()[0] == 120
+    finally:
+        conn.close()
+
+    for momento in ("momento2", "momento3"):
+        puntajes = [_entrega(clave)["puntaje"] for clave in range(120) if _entrega(clave)["momento"] == momento]
+        resumen = evaluaciones._leer_resumen(momento)
+        assert resumen["entregas"] == len(puntajes)
+        assert resumen["promedio"] == pytest.approx(sum(puntajes) / len(puntajes))
+        assert (resumen["minimo"], resumen["maximo"]) == (min(puntajes), max(puntajes))
+        assert resumen["aprobados"] == sum(p >= evaluaciones.NOTA_APROBACION for p in puntajes)
+
+
+def test_error_al_vaciar_la_cache_no_detiene_el_escritor(cola, monkeypatch):
+    class CacheRota:
+        def vaciar(self, espacio=None):
+            raise RuntimeError("caché no disponible")
+
+    monkeypatch.setattr(cache, "obtener_cache", lambda: CacheRota())
+
+    assert cola.enviar(_entrega(1)).result(timeout=10) is True
+    assert cola.enviar(_entrega(2)).result(timeout=10) is True
+    assert cola._hilo.is_alive()
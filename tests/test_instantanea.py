@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import cache, instantanea
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINA = str(RAIZ / "pages" / "3_📌_M2 Actvidad 3.py")
+
+
+@pytest.fixture(autouse=True)
+def en_raiz(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    cache.obtener_cache().vaciar()
+
+
+def test_ruta_incluye_version_del_generador():
+    ruta = instantanea.ruta_poblacion(50, 123)
+    assert instantanea.version_generador() in Path(ruta).name
+
+
+def test_actividad3_lee_solo_columnas_de_filtros_y_vista(monkeypatch):
+    lecturas = []
+    leer_tabla = pq.read_table
+
+    def espia(ruta, columns=None, **kwargs):
+        # El perfil de calidad lee la población completa en segundo plano
+        if columns is not None:
+            lecturas.append(list(columns))
+        return leer_tabla(ruta, columns=columns, **kwargs)
+
+    monkeypatch.setattr(instantanea.pq, "read_table", espia)
+
+    app = AppTest.from_file(PAGINA, default_timeout=120)
+    app.run()
+    assert not app.exception
+
+    lecturas.clear()
+    app.multiselect(key="columnas_visibles").set_value(["nombre_completo"])
+    app.checkbox(key="filtro_edad").check()
+    app.run()
+    assert not app.exception
+    # Las columnas ya leídas en la primera ejecución no se vuelven a leer
+    assert lecturas == []
+
+    cache.obtener_cache().vaciar()
+    app.run()
+    assert not app.exception
+    assert lecturas == [["id", "edad", "nombre_completo"]]
+    mostrado = app.dataframe[0].value
+    assert list(mostrado.columns) == ["nombre_completo"]
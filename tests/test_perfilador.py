@@ -0,0 +1,55 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from utils import cache, perfilador
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINA = str(RAIZ / "pages" / "3_📌_M2 Actvidad 3.py")
+
+
+def test_perfilar():
+    df = pd.DataFrame({
+        "nota": [1.0, 2.0, 3.0, 4.0, 100.0, np.nan],
+        "ciudad": ["Cali", "Cali", "Pasto", None, "Pasto", "Neiva"],
+        "activo": [True, False, True, True, False, True],
+        "fecha": pd.to_datetime(["1990-01-01", "1990-06-01", "1995-01-01", None, "2000-01-01", "2000-02-01"]),
+    })
+    perfil = perfilador.perfilar(df, intervalos=4)
+    columnas = perfil["columnas"]
+
+    assert perfil["filas"] == 6
+    assert columnas["nulos"].to_dict() == {"nota": 1, "ciudad": 1, "activo": 0, "fecha": 1}
+    assert columnas["cardinalidad"].to_dict() == {"nota": 5, "ciudad": 3, "activo": 2, "fecha": 5}
+    # Cuartiles 2 y 4: todo lo que quede fuera de [-1, 7] es atípico
+    assert columnas.loc["nota", "atípicos"] == 1
+    assert columnas.loc["nota", ["mínimo", "máximo"]].tolist() == [1.0, 100.0]
+    assert columnas[["atípicos", "mínimo"]].loc[["ciudad", "activo", "fecha"]].isna().all().all()
+
+    assert set(perfil["histogramas"]) == {"nota", "fecha"}
+    assert perfil["histogramas"]["nota"]["conteos"].tolist() == [4, 0, 0, 1]
+    # Las fechas se agrupan por año: 1990, 1990, 1995, 2000, 2000
+    assert perfil["histogramas"]["fecha"]["conteos"].tolist() == [2, 0, 1, 2]
+
+
+def test_actividad3_muestra_el_error_del_perfil(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    cache.obtener_cache().vaciar()
+
+    def fallar(df, intervalos=perfilador.INTERVALOS_HISTOGRAMA):
+        raise RuntimeError("perfil roto")
+
+    monkeypatch.setattr(perfilador, "perfilar", fallar)
+
+    app = AppTest.from_file(PAGINA, default_timeout=120)
+    app.run()
+    fin = time.monotonic() + 30
+    while not app.error and time.monotonic() < fin:
+        time.sleep(0.1)
+        app.run()
+
+    assert not app.exception
+    assert "perfil roto" in app.error[0].value
@@ -0,0 +1,81 @@
+import glob
+import json
+import os
+import time
+
+import pytest
+
+from utils import registro
+
+
+@pytest.fixture
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(registro, "DIRECTORIO", str(tmp_path))
+    monkeypatch.setattr(registro, "DIRECTORIO_PARQUET", str(tmp_path / "parquet"))
+    monkeypatch.setattr(registro, "INTERVALO_ESCRITURA_SEGUNDOS", 0.05)
+    return str(tmp_path)
+
+
+def _registro(i):
+    return {"fecha": "2026-01-01T00:00:00.000", "sesion": "s", "pagina": "p",
+            "widgets": ["w"], "duracion_ms": float(i), "filas": i}
+
+
+def _esperar(condicion, limite=10):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin
+        time.sleep(0.02)
+
+
+def test_compactar_no_toca_el_segmento_activo(directorio):
+    escritor = registro.EscritorSegmentos(directorio, max_bytes=1)
+    try:
+        escritor.registrar(_registro(1))
+        _esperar(lambda: glob.glob(os.path.join(directorio, "segmento-*.jsonl")))
+
+        # El segmento activo llegó al tamaño máximo: se cierra en el siguiente ciclo
+        _esperar(lambda: glob.glob(os.path.join(directorio, "*.cerrado")))
+        escritor.max_bytes = 1 << 20
+        escritor.registrar(_registro(2))
+        _esperar(lambda: glob.glob(os.path.join(directorio, "segmento-*.jsonl")))
+
+        assert registro.compactar() == 1
+        assert not glob.glob(os.path.join(directorio, "*.cerrado"))
+        assert len(glob.glob(os.path.join(directorio, "segmento-*.jsonl"))) == 1
+    finally:
+        escritor.cerrar()
+
+    # Al cerrar el escritor su último segmento también queda cerrado
+    assert registro.compactar() == 1
+    todos = registro.cargar_interacciones()
+    assert sorted(todos["filas"].tolist()) == [1, 2]
+
+
+def _escribir_segmento(ruta, registros, resto=""):
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps(registro) + "\n" for registro in registros) + resto)
+
+
+def test_cargar_ignora_una_linea_a_medio_escribir(directorio):
+    # Un escritor añadiendo al segmento activo mientras Telemetría lo lee
+    activo = os.path.join(directorio, "segmento-20260101-000000-1-0001.jsonl")
+    _escribir_segmento(activo, [_registro(1), _registro(2)], resto='{"fecha": "2026-01-01T00:0')
+
+    todos = registro.cargar_interacciones()
+    assert todos["filas"].tolist() == [1, 2]
+
+
+def test_compactar_toma_segmentos_abandonados(directorio):
+    abandonado = os.path.join(directorio, "segmento-20260101-000000-999999-0001.jsonl")
+    reciente = os.path.join(directorio, "segmento-20260101-000100-999998-0001.jsonl")
+    _escribir_segmento(abandonado, [_registro(1), _registro(2)], resto='{"fecha"')
+    _escribir_segmento(reciente, [_registro(3)])
+
+    # El proceso que lo escribía terminó sin cerrarlo hace tiempo
+    viejo = time.time() - registro.EDAD_ABANDONO_SEGUNDOS - 1
+    os.utime(abandonado, (viejo, viejo))
+
+    assert registro.compactar() == 2
+    assert glob.glob(os.path.join(directorio, "segmento-*")) == [reciente]
+    assert sorted(registro.cargar_interacciones()["filas"].tolist()) == [1, 2, 3]
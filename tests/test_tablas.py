@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import cache, tablas
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINA = str(RAIZ / "pages" / "2_📌_M2 Actvidad 2.py")
+
+
+@pytest.fixture(autouse=True)
+def en_raiz(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    cache.obtener_cache().vaciar()
+
+
+@pytest.fixture
+def lecturas(monkeypatch):
+    """Columnas pedidas en cada lectura del CSV (sin las muestras del catálogo)."""
+    registro = []
+    leer_csv = tablas._LECTORES["csv"]
+
+    def espia(nombre, columnas):
+        registro.append(list(columnas))
+        return leer_csv(nombre, columnas)
+
+    monkeypatch.setitem(tablas._LECTORES, "csv", espia)
+    return registro
+
+
+def test_columnas_se_leen_una_vez(lecturas):
+    tabla = tablas.obtener_tabla("estudiantes")
+    parcial = tabla.columnas(["edad", "nombre"])
+    assert list(parcial.columns) == ["edad", "nombre"]
+    assert lecturas == [["edad", "nombre"]]
+
+    # Completar la tabla solo lee las columnas que faltan
+    completa = tabla.columnas()
+    assert list(completa.columns) == tabla.esquema
+    faltantes = [columna for columna in tabla.esquema if columna not in ("edad", "nombre")]
+    assert lecturas == [["edad", "nombre"], faltantes]
+
+    # Pedir todas las columnas ya cargadas devuelve la tabla guardada, sin copiarla ni leer
+    assert tablas.obtener_tabla("estudiantes").columnas() is completa
+    tabla.columnas(["nombre"])
+    assert len(lecturas) == 2
+
+
+def test_actividad2_abre_en_la_vista_general(lecturas):
+    app = AppTest.from_file(PAGINA, default_timeout=60)
+    app.run()
+    assert not app.exception
+    assert app.radio(key="seccion").value == "🔍 Vista General"
+    assert list(app.dataframe[0].value.columns) == tablas.obtener_tabla("estudiantes").esquema
+    assert len(lecturas) == 1
+
+    # Los filtros exportan todas las columnas, ya cargadas por la vista general
+    app.radio(key="seccion").set_value("📈 Filtros Avanzados").run()
+    assert not app.exception
+    assert len(lecturas) == 1
+    assert list(app.dataframe[0].value.columns) == tablas.obtener_tabla("estudiantes").esquema
+
+
+def test_actividad2_lee_solo_las_columnas_de_la_seccion(lecturas):
+    app = AppTest.from_file(PAGINA, default_timeout=60)
+    app.session_state["seccion"] = "🎯 Selección Columnas"
+    app.run()
+    assert not app.exception
+    assert [sorted(columnas) for columnas in lecturas] == [["edad", "nombre", "promedio"]]
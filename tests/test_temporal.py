@@ -0,0 +1,57 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils import cache, temporal
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINA = str(RAIZ / "pages" / "3_📌_M2 Actvidad 3.py")
+
+
+@pytest.fixture(autouse=True)
+def en_raiz(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    cache.obtener_cache().vaciar()
+
+
+def test_indice_temporal_por_anio():
+    fechas = pd.DataFrame({"fecha": pd.to_datetime(["1990-05-01", "1985-01-31", "1990-12-31", "1991-01-01"])})
+    indice = temporal.IndiceTemporal(temporal.agregar_columnas_temporales(fechas, "fecha"))
+    assert indice.mascara_anio(1990).tolist() == [True, False, True, False]
+
+
+def test_indice_edad_por_grupos():
+    indice = temporal.IndiceEdad(np.array([17, 30, 44, 26, 61]))
+    assert indice.mascara_grupos(["26-35"]).tolist() == [False, True, False, True, False]
+    assert indice.mascara_grupos(["15-17", "61+"]).tolist() == [True, False, False, False, True]
+
+
+def test_actividad3_grupo_de_edad_usa_la_edad_mostrada():
+    app = AppTest.from_file(PAGINA, default_timeout=120)
+    app.run()
+    app.checkbox(key="filtro_grupo_edad").check().run()
+    app.multiselect(key="grupos_edad").set_value(["26-35"]).run()
+    assert not app.exception
+
+    edades = app.dataframe[0].value["edad"]
+    assert len(edades) > 0
+    assert edades.between(26, 35).all()
+
+
+def test_perfil_sin_columnas_derivadas():
+    app = AppTest.from_file(PAGINA, default_timeout=120)
+    app.run()
+    limite = time.monotonic() + 60
+    while len(app.dataframe) < 2:
+        # El perfil se calcula en segundo plano; la siguiente ejecución lo muestra
+        assert time.monotonic() < limite
+        time.sleep(0.2)
+        app.run()
+
+    perfil = app.dataframe[1].value
+    assert not set(temporal.COLUMNAS_DERIVADAS) & set(perfil.index)
+    assert "fecha_nacimiento" in perfil.index
@@ -0,0 +1 @@
+# Módulos compartidos por las páginas de la aplicación
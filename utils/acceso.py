@@ -0,0 +1,24 @@
+"""Acceso a las acciones reservadas al docente.
+
+Las vistas y acciones que afectan a todos los usuarios (notas de las
+evaluaciones, vaciado de la caché, compactación del registro) solo se
+habilitan si está definida la variable de entorno ``NTP_CLAVE_DOCENTE`` y se
+escribe esa clave.
+"""
+
+import hmac
+import os
+
+import streamlit as st
+
+VARIABLE_CLAVE = "NTP_CLAVE_DOCENTE"
+
+
+def es_docente(key, accion="esta vista"):
+    """Pide la clave del docente; devuelve ``True`` si la escrita es correcta."""
+    clave = os.environ.get(VARIABLE_CLAVE)
+    if not clave:
+        st.info(f"Define la variable de entorno `{VARIABLE_CLAVE}` para habilitar {accion}.")
+        return False
+    escrita = st.text_input("Clave del docente", type="password", key=key)
+    return hmac.compare_digest(escrita.encode("utf-8"), clave.encode("utf-8"))
@@ -0,0 +1,255 @@
+"""Caché de resultados compartida por todas las páginas.
+
+Un único objeto ``CacheConsultas`` por proceso del servidor guarda resultados de
+filtros, resúmenes, consultas SQL y exportaciones. Tiene:
+
+- límite de tamaño con expulsión LRU y contabilidad de bytes por entrada,
+- caducidad (TTL) por entrada,
+- espacios de nombres por página,
+- contadores de aciertos, fallos, expulsiones y rechazos por espacio.
+
+Un valor más grande que todo el límite no se guarda y cuenta como rechazado.
+
+Las entradas pueden llevar la versión (hash) del archivo de origen: si cambia,
+la entrada deja de valer. Esas entradas también se guardan en el nivel en disco
+de ``utils.cache_disco`` cuando está activado, para sobrevivir a reinicios.
+
+Los valores devueltos se comparten entre sesiones: no deben modificarse.
+El límite y el TTL se ajustan con ``NTP_CACHE_MAX_MB`` y ``NTP_CACHE_TTL``.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from utils import cache_disco
+
+MAX_BYTES = int(float(os.environ.get("NTP_CACHE_MAX_MB", 256)) * 1024 * 1024)
+TTL_SEGUNDOS = float(os.environ.get("NTP_CACHE_TTL", 30 * 60))
+
+
+def tamano_en_bytes(valor):
+    """Estimación del tamaño en memoria de un valor guardado en caché.
+
+    Se recorre el valor sin serializarlo: los DataFrame y arreglos informan su
+    tamaño, los contenedores y objetos suman el de sus elementos o atributos.
+    """
+    return _tamano(valor, set())
+
+
+def _tamano(valor, vistos):
+    # Un objeto compartido (o referenciado por sí mismo) se cuenta una vez
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=True).sum() if isinstance(valor, pd.DataFrame)
+                   else valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        if valor.dtype == object:
+            return valor.nbytes + sum(_tamano(elemento, vistos) for elemento in valor.flat)
+        return valor.nbytes
+    if isinstance(valor, (bytes, bytearray, str)):
+        return len(valor)
+    if isinstance(valor, (tuple, list, set, frozenset)):
+        return sum(_tamano(elemento, vistos) for elemento in valor)
+    if isinstance(valor, dict):
+        return sum(_tamano(elemento, vistos) for elemento in valor.values())
+    if hasattr(valor, "__dict__"):
+        return sys.getsizeof(valor) + _tamano(vars(valor), vistos)
+    return sys.getsizeof(valor)
+
+
+class CacheConsultas:
+    def __init__(self, max_bytes=MAX_BYTES, ttl=TTL_SEGUNDOS, disco=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disco = disco
+        self._bloqueo = threading.RLock()
+        # (espacio, clave) -> (valor, bytes, creado, expira, version)
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._contadores = {}
+        # Cálculos en curso lanzados con obtener_futuro: (espacio, clave, version) -> Future
+        self._pendientes = {}
+
+    def _contador(self, espacio):
+        if espacio not in self._contadores:
+            self._contadores[espacio] = {
+                "aciertos": 0, "aciertos_disco": 0, "fallos": 0,
+                "expulsiones": 0, "caducadas": 0, "rechazadas": 0
+            }
+        return self._contadores[espacio]
+
+    def _quitar(self, llave):
+        tamano = self._entradas.pop(llave)[1]
+        self._bytes -= tamano
+
+    def buscar(self, espacio, clave, version=None):
+        """Devuelve ``(True, valor)`` si hay una entrada vigente o ``(False, None)``.
+
+        Si la entrada no está en memoria pero sí en disco con la misma
+        ``version``, se recupera de allí y se vuelve a cargar en memoria.
+        """
+        llave = (espacio, clave)
+        with self._bloqueo:
+            contador = self._contador(espacio)
+            entrada = self._entradas.get(llave)
+            if entrada is not None and entrada[3] < time.monotonic():
+                self._quitar(llave)
+                contador["caducadas"] += 1
+                entrada = None
+            if entrada is not None and entrada[4] != version:
+                self._quitar(llave)
+                entrada = None
+            if entrada is not None:
+                self._entradas.move_to_end(llave)
+                contador["aciertos"] += 1
+                return True, entrada[0]
+
+        if version is not None and self.disco is not None:
+            encontrado, valor = self.disco.buscar(espacio, clave, version)
+            if encontrado:
+                self._guardar_en_memoria(espacio, clave, valor, None, version)
+                with self._bloqueo:
+                    contador["aciertos_disco"] += 1
+                return True, valor
+
+        with self._bloqueo:
+            contador["fallos"] += 1
+        return False, None
+
+    def guardar(self, espacio, clave, valor, ttl=None, version=None):
+        self._guardar_en_memoria(espacio, clave, valor, ttl, version)
+        if version is not None and self.disco is not None:
+            self.disco.guardar(espacio, clave, valor, version)
+        return valor
+
+    def _guardar_en_memoria(self, espacio, clave, valor, ttl, version):
+        tamano = tamano_en_bytes(valor)
+        # Un valor más grande que toda la caché no se guarda
+        if tamano > self.max_bytes:
+            with self._bloqueo:
+                self._contador(espacio)["rechazadas"] += 1
+            return
+
+        llave = (espacio, clave)
+        ahora = time.monotonic()
+        with self._bloqueo:
+            if llave in self._entradas:
+                self._quitar(llave)
+            self._entradas[llave] = (valor, tamano, time.time(), ahora + (ttl or self.ttl), version)
+            self._bytes += tamano
+
+            # Expulsar las entradas usadas hace más tiempo hasta caber en el límite
+            while self._bytes > self.max_bytes:
+                llave_vieja = next(iter(self._entradas))
+                self._quitar(llave_vieja)
+                self._contador(llave_vieja[0])["expulsiones"] += 1
+
+    def obtener(self, espacio, clave, calcular, ttl=None, version=None):
+        """Devuelve el valor en caché o lo calcula con ``calcular()`` y lo guarda."""
+        encontrado, valor = self.buscar(espacio, clave, version)
+        if encontrado:
+            return valor
+        return self.guardar(espacio, clave, calcular(), ttl, version)
+
+    def obtener_futuro(self, espacio, clave, funcion, *args, hilo=False, ttl=None, version=None):
+        """Como ``obtener`` pero calcula en el pool de ``utils.ejecutor``.
+
+        Devuelve siempre un ``Future``; en un acierto ya está resuelto. Si el
+        mismo cálculo ya está en curso (p. ej. por otra ejecución de la página),
+        se devuelve ese futuro en lugar de lanzarlo otra vez.
+        """
+        from utils import ejecutor
+
+        encontrado, valor = self.buscar(espacio, clave, version)
+        if encontrado:
+            futuro = Future()
+            futuro.set_result(valor)
+            return futuro
+
+        pendiente = (espacio, clave, version)
+        with self._bloqueo:
+            if pendiente in self._pendientes:
+                return self._pendientes[pendiente]
+            futuro = ejecutor.enviar(funcion, *args, hilo=hilo)
+            self._pendientes[pendiente] = futuro
+
+        def _guardar_resultado(terminado):
+            if terminado.exception() is None:
+                self.guardar(espacio, clave, terminado.result(), ttl, version)
+            with self._bloqueo:
+                self._pendientes.pop(pendiente, None)
+
+        futuro.add_done_callback(_guardar_resultado)
+        return futuro
+
+    def vaciar(self, espacio=None):
+        """Elimina todas las entradas, o solo las de ``espacio``, también en disco."""
+        with self._bloqueo:
+            for llave in [llave for llave in self._entradas if espacio is None or llave[0] == espacio]:
+                self._quitar(llave)
+        if self.disco is not None:
+            self.disco.vaciar(espacio)
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def espacios(self):
+        with self._bloqueo:
+            return sorted(self._contadores)
+
+    def estadisticas(self):
+        """Resumen por espacio: entradas, bytes y contadores."""
+        with self._bloqueo:
+            filas = []
+            for espacio, contador in sorted(self._contadores.items()):
+                entradas = [datos for llave, datos in self._entradas.items() if llave[0] == espacio]
+                aciertos = contador["aciertos"] + contador["aciertos_disco"]
+                consultas = aciertos + contador["fallos"]
+                filas.append({
+                    "espacio": espacio,
+                    "entradas": len(entradas),
+                    "bytes": sum(datos[1] for datos in entradas),
+                    **contador,
+                    "tasa_aciertos": aciertos / consultas if consultas else 0.0,
+                })
+            return filas
+
+    def entradas(self):
+        """Lista de entradas vigentes, de la menos a la más recientemente usada."""
+        ahora = time.monotonic()
+        with self._bloqueo:
+            return [
+                {
+                    "espacio": espacio,
+                    "clave": repr(clave),
+                    "tipo": type(datos[0]).__name__,
+                    "bytes": datos[1],
+                    "creada": time.strftime("%H:%M:%S", time.localtime(datos[2])),
+                    "expira_en_s": round(datos[3] - ahora),
+                }
+                for (espacio, clave), datos in self._entradas.items()
+            ]
+
+
+_cache = None
+_bloqueo_global = threading.Lock()
+
+
+def obtener_cache():
+    """Devuelve la caché compartida del proceso."""
+    global _cache
+    with _bloqueo_global:
+        if _cache is None:
+            _cache = CacheConsultas(disco=cache_disco.obtener_cache_disco())
+        return _cache
@@ -0,0 +1,202 @@
+"""Nivel persistente de la caché, en un directorio local.
+
+Permite que el estado "caliente" sobreviva a reinicios del servidor. Cada
+entrada se identifica por el SHA-256 de su espacio y clave; el índice vive en
+una base SQLite y los valores en archivos aparte:
+
+- los DataFrames se guardan en formato Arrow IPC (lectura por mapeo en memoria),
+- el resto de valores (resúmenes, índices) con pickle, junto a
+  ``VERSION_PICKLE``.
+
+Cada entrada guarda el hash del archivo de origen; si al leerla el origen ya
+cambió, la entrada se descarta. También se descarta una entrada que no se puede
+leer: archivo dañado, otra ``VERSION_PICKLE`` o clases que ya no existen. Se activa definiendo ``NTP_CACHE_DISCO`` con el
+directorio a usar; ``NTP_CACHE_DISCO_MAX_MB`` limita su tamaño.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+
+DIRECTORIO = os.environ.get("NTP_CACHE_DISCO")
+MAX_BYTES = int(float(os.environ.get("NTP_CACHE_DISCO_MAX_MB", 1024)) * 1024 * 1024)
+
+# Subir al cambiar las clases o estructuras que se guardan con pickle
+VERSION_PICKLE = 1
+
+
+def _llave(espacio, clave):
+    return hashlib.sha256(repr((espacio, clave)).encode("utf-8")).hexdigest()
+
+
+class CacheDisco:
+    def __init__(self, directorio, max_bytes=MAX_BYTES):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(os.path.join(directorio, "objetos"), exist_ok=True)
+
+        with self._conectar() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS entradas (
+                llave TEXT PRIMARY KEY,
+                espacio TEXT,
+                formato TEXT,
+                hash_fuente TEXT,
+                bytes INTEGER,
+                creada REAL,
+                usada REAL
+            )
+            """)
+
+    @contextmanager
+    def _conectar(self):
+        conn = sqlite3.connect(os.path.join(self.directorio, "indice.db"), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ruta(self, llave, formato):
+        return os.path.join(self.directorio, "objetos", llave[:2], f"{llave}.{formato}")
+
+    def _borrar(self, conn, llave, formato):
+        conn.execute("DELETE FROM entradas WHERE llave = ?", (llave,))
+        try:
+            os.remove(self._ruta(llave, formato))
+        except FileNotFoundError:
+            pass
+
+    def buscar(self, espacio, clave, hash_fuente):
+        """Devuelve ``(True, valor)`` si hay una entrada válida para ``hash_fuente``."""
+        llave = _llave(espacio, clave)
+        with self._conectar() as conn:
+            fila = conn.execute(
+                "SELECT formato, hash_fuente FROM entradas WHERE llave = ?", (llave,)
+            ).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return False, None
+
+            formato, hash_guardado = fila
+            if hash_guardado != hash_fuente:
+                # El archivo de origen cambió: la entrada ya no sirve
+                self._borrar(conn, llave, formato)
+                self.fallos += 1
+                return False, None
+
+            try:
+                valor = self._leer(self._ruta(llave, formato), formato)
+            except Exception:
+                # Un pickle de otra versión del código puede fallar con cualquier
+                # excepción (AttributeError, ImportError...): se descarta la entrada
+                self._borrar(conn, llave, formato)
+                self.fallos += 1
+                return False, None
+
+            conn.execute("UPDATE entradas SET usada = ? WHERE llave = ?", (time.time(), llave))
+        self.aciertos += 1
+        return True, valor
+
+    def guardar(self, espacio, clave, valor, hash_fuente):
+        llave = _llave(espacio, clave)
+        formato = "arrow" if isinstance(valor, pd.DataFrame) else "pickle"
+        ruta = self._ruta(llave, formato)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+        # Escribir en un temporal y renombrar para que un lector nunca vea un archivo a medias
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self._escribir(temporal, valor, formato)
+            os.replace(temporal, ruta)
+        except Exception:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return
+
+        ahora = time.time()
+        with self._conectar() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (llave, espacio, formato, hash_fuente, os.path.getsize(ruta), ahora, ahora)
+            )
+            self._recortar(conn)
+
+    def _recortar(self, conn):
+        """Elimina las entradas usadas hace más tiempo hasta caber en el límite."""
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entradas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for llave, formato, tamano in conn.execute(
+            "SELECT llave, formato, bytes FROM entradas ORDER BY usada"
+        ).fetchall():
+            self._borrar(conn, llave, formato)
+            total -= tamano
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _escribir(ruta, valor, formato):
+        if formato == "arrow":
+            tabla = pa.Table.from_pandas(valor, preserve_index=True)
+            with pa.OSFile(ruta, "wb") as archivo:
+                with pa.ipc.new_file(archivo, tabla.schema) as escritor:
+                    escritor.write_table(tabla)
+        else:
+            with open(ruta, "wb") as archivo:
+                pickle.dump((VERSION_PICKLE, valor), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _leer(ruta, formato):
+        if formato == "arrow":
+            with pa.memory_map(ruta, "r") as fuente:
+                return pa.ipc.open_file(fuente).read_all().to_pandas()
+        with open(ruta, "rb") as archivo:
+            version, valor = pickle.load(archivo)
+        if version != VERSION_PICKLE:
+            raise ValueError(f"Entrada de la versión {version}, se esperaba {VERSION_PICKLE}")
+        return valor
+
+    def vaciar(self, espacio=None):
+        with self._conectar() as conn:
+            if espacio is None:
+                filas = conn.execute("SELECT llave, formato FROM entradas").fetchall()
+            else:
+                filas = conn.execute(
+                    "SELECT llave, formato FROM entradas WHERE espacio = ?", (espacio,)
+                ).fetchall()
+            for llave, formato in filas:
+                self._borrar(conn, llave, formato)
+
+    def estadisticas(self):
+        """Resumen por espacio: entradas y bytes en disco."""
+        with self._conectar() as conn:
+            filas = conn.execute(
+                "SELECT espacio, COUNT(*), SUM(bytes) FROM entradas GROUP BY espacio ORDER BY espacio"
+            ).fetchall()
+        return [{"espacio": espacio, "entradas": n, "bytes": tamano} for espacio, n, tamano in filas]
+
+
+_cache_disco = None
+_bloqueo_global = threading.Lock()
+
+
+def obtener_cache_disco():
+    """Devuelve el nivel en disco, o ``None`` si no está activado."""
+    global _cache_disco
+    if not DIRECTORIO:
+        return None
+    with _bloqueo_global:
+        if _cache_disco is None:
+            _cache_disco = CacheDisco(DIRECTORIO)
+        return _cache_disco
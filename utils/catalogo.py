@@ -0,0 +1,343 @@
+"""Catálogo de los datasets de la aplicación.
+
+El manifiesto ``catalogo.json`` describe cada dataset (ruta, formato y, en
+SQLite, la tabla). Los metadatos dinámicos (esquema, número de filas, tamaño y
+hash del contenido) se calculan de forma perezosa, leyendo solo cabeceras o
+metadatos del archivo, y se memorizan hasta que el archivo cambie en disco.
+
+Los tipos del esquema usan el mismo vocabulario en todos los formatos
+(``TIPOS``), para poder comparar datasets sin importar cómo están guardados.
+
+Varios datasets SQLite pueden compartir un archivo: su hash se calcula solo con
+la tabla del dataset, así escribir en otra tabla no cambia su versión.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+RUTA_MANIFIESTO = "catalogo.json"
+
+# Por encima de este número de filas las vistas deberían paginar
+LIMITE_FILAS_COMPLETO = 5_000
+
+# Vocabulario común de tipos de columna
+TIPOS = ("entero", "decimal", "booleano", "fecha", "texto", "otro")
+
+_bloqueo = threading.Lock()
+_manifiesto = None
+_memo = {}
+
+
+def manifiesto():
+    """Devuelve el manifiesto como diccionario ``nombre -> entrada``."""
+    global _manifiesto
+    with _bloqueo:
+        if _manifiesto is None:
+            with open(RUTA_MANIFIESTO, encoding="utf-8") as f:
+                _manifiesto = json.load(f)
+        return _manifiesto
+
+
+def nombres():
+    return list(manifiesto())
+
+
+def entrada(nombre):
+    try:
+        return manifiesto()[nombre]
+    except KeyError:
+        raise KeyError(f"El dataset '{nombre}' no está registrado en {RUTA_MANIFIESTO}") from None
+
+
+def ruta(nombre):
+    return entrada(nombre)["ruta"]
+
+
+def formato(nombre):
+    return entrada(nombre)["formato"]
+
+
+def _firma(nombre):
+    """Identifica la versión del archivo sin leer su contenido."""
+    estado = os.stat(ruta(nombre))
+    firma = (estado.st_mtime_ns, estado.st_size)
+    if formato(nombre) == "sqlite":
+        # En modo WAL los cambios quedan en el archivo -wal hasta el siguiente checkpoint
+        try:
+            wal = os.stat(ruta(nombre) + "-wal")
+            firma += (wal.st_mtime_ns, wal.st_size)
+        except FileNotFoundError:
+            pass
+    return firma
+
+
+def _memorizado(nombre, campo, calcular):
+    firma = _firma(nombre)
+    clave = (nombre, campo)
+    with _bloqueo:
+        guardado = _memo.get(clave)
+    if guardado is not None and guardado[0] == firma:
+        return guardado[1]
+
+    valor = calcular(nombre)
+    with _bloqueo:
+        _memo[clave] = (firma, valor)
+    return valor
+
+
+# --------------------------------------------------
+# Tipos de cada formato al vocabulario común
+# --------------------------------------------------
+
+def _tipo_pandas(tipo):
+    import pandas as pd
+
+    if pd.api.types.is_bool_dtype(tipo):
+        return "booleano"
+    if pd.api.types.is_integer_dtype(tipo):
+        return "entero"
+    if pd.api.types.is_float_dtype(tipo):
+        return "decimal"
+    if pd.api.types.is_datetime64_any_dtype(tipo):
+        return "fecha"
+    if pd.api.types.is_object_dtype(tipo) or pd.api.types.is_string_dtype(tipo) \
+            or isinstance(tipo, pd.CategoricalDtype):
+        return "texto"
+    return "otro"
+
+
+_TIPOS_JSON = {"bool": "booleano", "int": "entero", "float": "decimal", "str": "texto"}
+
+
+def _tipo_sqlite(declarado):
+    # Reglas de afinidad de tipos de SQLite, con booleanos y fechas aparte
+    declarado = (declarado or "").upper()
+    if "BOOL" in declarado:
+        return "booleano"
+    if "DATE" in declarado or "TIME" in declarado:
+        return "fecha"
+    if "INT" in declarado:
+        return "entero"
+    if any(clave in declarado for clave in ("CHAR", "CLOB", "TEXT")):
+        return "texto"
+    if not declarado or "BLOB" in declarado:
+        return "otro"
+    return "decimal"
+
+
+def _tipo_arrow(tipo):
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(tipo):
+        tipo = tipo.value_type
+    if pa.types.is_boolean(tipo):
+        return "booleano"
+    if pa.types.is_integer(tipo):
+        return "entero"
+    if pa.types.is_floating(tipo) or pa.types.is_decimal(tipo):
+        return "decimal"
+    if pa.types.is_temporal(tipo):
+        return "fecha"
+    if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+        return "texto"
+    return "otro"
+
+
+# --------------------------------------------------
+# Lectores de metadatos por formato
+# --------------------------------------------------
+
+def _contar_registros_csv(ruta_archivo):
+    """Registros del CSV, cabecera incluida.
+
+    Sin comillas en el archivo, cada salto de línea termina un registro y basta
+    contarlos por bloques; con comillas un campo puede contener saltos de línea
+    y se recorre con el lector de ``csv``.
+    """
+    lineas = 0
+    ultimo = b"\n"
+    with open(ruta_archivo, "rb") as f:
+        while bloque := f.read(1 << 20):
+            if b'"' in bloque:
+                break
+            lineas += bloque.count(b"\n")
+            ultimo = bloque[-1:]
+        else:
+            # La última línea puede no terminar en salto de línea
+            if ultimo != b"\n":
+                lineas += 1
+            return lineas
+
+    with open(ruta_archivo, encoding="utf-8", errors="replace", newline="") as f:
+        return sum(1 for registro in csv.reader(f) if registro)
+
+
+def _esquema_csv(nombre):
+    import pandas as pd
+
+    # Una muestra pequeña basta para inferir los tipos de cada columna
+    muestra = pd.read_csv(ruta(nombre), nrows=100)
+    return {columna: _tipo_pandas(tipo) for columna, tipo in muestra.dtypes.items()}
+
+
+def _filas_csv(nombre):
+    return max(_contar_registros_csv(ruta(nombre)) - 1, 0)
+
+
+def _esquema_excel(nombre):
+    import pandas as pd
+
+    muestra = pd.read_excel(ruta(nombre), nrows=100)
+    return {columna: _tipo_pandas(tipo) for columna, tipo in muestra.dtypes.items()}
+
+
+def _filas_excel(nombre):
+    from openpyxl import load_workbook
+
+    # En modo de solo lectura openpyxl toma la dimensión de la hoja del XML
+    libro = load_workbook(ruta(nombre), read_only=True)
+    try:
+        return max(libro.active.max_row - 1, 0)
+    finally:
+        libro.close()
+
+
+def _leer_json(nombre):
+    with open(ruta(nombre), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _esquema_json(nombre):
+    # JSON no tiene metadatos; el archivo es pequeño y se lee completo
+    registros = _leer_json(nombre)
+    if not registros:
+        return {}
+    return {columna: _TIPOS_JSON.get(type(valor).__name__, "otro") for columna, valor in registros[0].items()}
+
+
+def _filas_json(nombre):
+    return len(_leer_json(nombre))
+
+
+def _esquema_sqlite(nombre):
+    conn = sqlite3.connect(ruta(nombre))
+    try:
+        columnas = conn.execute(f"PRAGMA table_info({entrada(nombre)['tabla']})").fetchall()
+        return {columna[1]: _tipo_sqlite(columna[2]) for columna in columnas}
+    finally:
+        conn.close()
+
+
+def _filas_sqlite(nombre):
+    conn = sqlite3.connect(ruta(nombre))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {entrada(nombre)['tabla']}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _esquema_parquet(nombre):
+    import pyarrow.parquet as pq
+
+    esquema_arrow = pq.read_schema(ruta(nombre))
+    return {campo.name: _tipo_arrow(campo.type) for campo in esquema_arrow}
+
+
+def _filas_parquet(nombre):
+    import pyarrow.parquet as pq
+
+    return pq.read_metadata(ruta(nombre)).num_rows
+
+
+_LECTORES = {
+    "csv": (_esquema_csv, _filas_csv),
+    "excel": (_esquema_excel, _filas_excel),
+    "json": (_esquema_json, _filas_json),
+    "sqlite": (_esquema_sqlite, _filas_sqlite),
+    "parquet": (_esquema_parquet, _filas_parquet),
+}
+
+
+def _hash_sqlite(nombre):
+    sha = hashlib.sha256()
+    tabla = entrada(nombre)["tabla"]
+    conn = sqlite3.connect(ruta(nombre))
+    try:
+        definicion = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)
+        ).fetchone()
+        # Una tabla que aún no existe tiene el hash de una tabla vacía
+        if definicion is not None:
+            sha.update(definicion[0].encode("utf-8"))
+            for fila in conn.execute(f"SELECT * FROM {tabla} ORDER BY rowid"):
+                sha.update(repr(fila).encode("utf-8"))
+    finally:
+        conn.close()
+    return sha.hexdigest()
+
+
+def _calcular_hash(nombre):
+    if formato(nombre) == "sqlite":
+        return _hash_sqlite(nombre)
+
+    sha = hashlib.sha256()
+    with open(ruta(nombre), "rb") as f:
+        while bloque := f.read(1 << 20):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+# --------------------------------------------------
+# API pública
+# --------------------------------------------------
+
+def esquema(nombre):
+    """Columnas y tipos (del vocabulario ``TIPOS``) del dataset, sin cargarlo completo."""
+    return _memorizado(nombre, "esquema", _LECTORES[formato(nombre)][0])
+
+
+def filas(nombre):
+    """Número de filas de datos (sin contar la cabecera)."""
+    return _memorizado(nombre, "filas", _LECTORES[formato(nombre)][1])
+
+
+def tamano_bytes(nombre):
+    return _firma(nombre)[1]
+
+
+def hash_contenido(nombre):
+    """SHA-256 del archivo (de la tabla, en SQLite); sirve como versión del dataset."""
+    return _memorizado(nombre, "hash", _calcular_hash)
+
+
+def existe(nombre):
+    return os.path.exists(ruta(nombre))
+
+
+def version(nombre):
+    """Hash del contenido o ``None`` si el archivo aún no existe."""
+    return hash_contenido(nombre) if existe(nombre) else None
+
+
+def debe_paginar(nombre, limite=LIMITE_FILAS_COMPLETO):
+    """Indica si conviene paginar la vista en lugar de mostrarlo completo."""
+    return filas(nombre) > limite
+
+
+def metadatos(nombre):
+    """Todos los metadatos del dataset en un diccionario."""
+    datos = entrada(nombre)
+    return {
+        "nombre": nombre,
+        "descripcion": datos.get("descripcion", ""),
+        "ruta": datos["ruta"],
+        "formato": datos["formato"],
+        "esquema": esquema(nombre),
+        "filas": filas(nombre),
+        "bytes": tamano_bytes(nombre),
+        "hash": hash_contenido(nombre),
+    }
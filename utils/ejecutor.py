@@ -0,0 +1,130 @@
+"""Servicio de ejecución paralela compartido por todas las páginas.
+
+Streamlit ejecuta cada página en un único hilo, así que el trabajo pesado de un
+usuario ocupa un solo núcleo. Este módulo mantiene un pool de procesos (y otro
+de hilos para trabajo de E/S) por proceso del servidor, de modo que las páginas
+puedan repartir tareas independientes y recibir futuros que consultan después.
+
+Las funciones enviadas al pool de procesos deben estar definidas a nivel de
+módulo (no dentro de una página) para poder serializarse.
+
+Streamlit registra la página en ejecución como ``sys.modules["__main__"]``. Un
+proceso iniciado con "spawn" vuelve a importar ``__main__``, es decir, volvería
+a ejecutar la página (que a su vez enviaría tareas al pool mientras el
+trabajador aún arranca). Por eso, al crear el pool, se inician de una vez
+todos los trabajadores con un ``__main__`` neutro; los envíos posteriores no
+crean procesos ni tocan ``sys.modules`` (que Streamlit también modifica en cada
+sesión). Un pool roto se descarta y se crea de nuevo.
+"""
+
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Número máximo de trabajadores; se puede ajustar por variable de entorno
+MAX_TRABAJADORES = int(os.environ.get("NTP_MAX_TRABAJADORES", min(8, os.cpu_count() or 1)))
+
+_bloqueo = threading.Lock()
+_pool_procesos = None
+_pool_hilos = None
+
+# Módulo sin ``__file__`` ni ``__spec__``: "spawn" no tiene nada que reimportar
+_MAIN_NEUTRO = types.ModuleType("__mp_main__")
+
+
+def _crear_pool_procesos():
+    # "spawn" evita heredar los hilos del servidor de Streamlit al hacer fork
+    pool = ProcessPoolExecutor(
+        max_workers=MAX_TRABAJADORES,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+    # El pool inicia los trabajadores a demanda, dentro de ``submit``: aquí se
+    # inician todos de una vez, con un ``__main__`` sin nada que reimportar
+    main = sys.modules.get("__main__")
+    sys.modules["__main__"] = _MAIN_NEUTRO
+    try:
+        for _ in range(MAX_TRABAJADORES):
+            pool._adjust_process_count()
+    finally:
+        # Si otra sesión registró entretanto su propia página, se respeta
+        if sys.modules.get("__main__") is _MAIN_NEUTRO:
+            sys.modules["__main__"] = main
+    return pool
+
+
+def obtener_pool_procesos():
+    """Devuelve el pool de procesos compartido, creándolo la primera vez."""
+    global _pool_procesos
+    with _bloqueo:
+        if _pool_procesos is None:
+            _pool_procesos = _crear_pool_procesos()
+        return _pool_procesos
+
+
+def _descartar_pool_procesos(pool):
+    """Descarta ``pool`` si sigue siendo el compartido; el siguiente envío crea otro."""
+    global _pool_procesos
+    with _bloqueo:
+        if _pool_procesos is pool:
+            _pool_procesos = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def obtener_pool_hilos():
+    """Devuelve el pool de hilos compartido para tareas de E/S."""
+    global _pool_hilos
+    with _bloqueo:
+        if _pool_hilos is None:
+            _pool_hilos = ThreadPoolExecutor(
+                max_workers=MAX_TRABAJADORES * 2,
+                thread_name_prefix="ntp-es"
+            )
+        return _pool_hilos
+
+
+def enviar(funcion, *args, hilo=False, **kwargs):
+    """Envía una tarea al pool y devuelve su ``Future``.
+
+    Con ``hilo=True`` la tarea se ejecuta en el pool de hilos (útil para
+    descargas o consultas que esperan E/S y no necesitan otro núcleo).
+
+    Si el pool de procesos quedó roto (un trabajador terminó de forma
+    abrupta), se reemplaza por uno nuevo y la tarea se envía a este.
+    """
+    if hilo:
+        return obtener_pool_hilos().submit(funcion, *args, **kwargs)
+
+    pool = obtener_pool_procesos()
+    try:
+        return pool.submit(funcion, *args, **kwargs)
+    except BrokenProcessPool:
+        _descartar_pool_procesos(pool)
+        return obtener_pool_procesos().submit(funcion, *args, **kwargs)
+
+
+def mapear(funcion, lista_argumentos, hilo=False):
+    """Ejecuta ``funcion`` para cada tupla de argumentos y devuelve los
+    resultados en el mismo orden."""
+    futuros = [enviar(funcion, *argumentos, hilo=hilo) for argumentos in lista_argumentos]
+    return [futuro.result() for futuro in futuros]
+
+
+def apagar():
+    """Cierra los pools; se llama automáticamente al terminar el proceso."""
+    global _pool_procesos, _pool_hilos
+    with _bloqueo:
+        if _pool_procesos is not None:
+            _pool_procesos.shutdown(wait=False, cancel_futures=True)
+            _pool_procesos = None
+        if _pool_hilos is not None:
+            _pool_hilos.shutdown(wait=False, cancel_futures=True)
+            _pool_hilos = None
+
+
+atexit.register(apagar)
@@ -0,0 +1,26 @@
+"""Estadísticas descriptivas calculadas por columna en paralelo."""
+
+import pandas as pd
+
+from utils import ejecutor
+
+# Con pocas filas serializar las columnas cuesta más que calcular en línea
+UMBRAL_FILAS_PARALELO = 200_000
+
+
+def describir_columna(serie):
+    return serie.describe()
+
+
+def describir(df, umbral_filas=UMBRAL_FILAS_PARALELO):
+    """Equivalente a ``df.describe()`` que reparte las columnas numéricas
+    entre el pool de procesos cuando el DataFrame es grande."""
+    numericas = df.select_dtypes(include="number")
+    if len(df) < umbral_filas or numericas.shape[1] < 2:
+        return df.describe()
+
+    resultados = ejecutor.mapear(
+        describir_columna,
+        [(numericas[columna],) for columna in numericas.columns]
+    )
+    return pd.concat(resultados, axis=1)
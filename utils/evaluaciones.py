@@ -0,0 +1,316 @@
+"""Entregas de las evaluaciones de los Momentos 2 y 3.
+
+Las entregas se guardan en ``entregas.db`` (la ruta del dataset ``entregas``
+del catálogo), una base propia fuera del control de versiones: contiene los
+nombres de los estudiantes y escribir en ella no cambia la versión de los
+datasets de ``educacion.db``. Para soportar muchas entregas simultáneas (p. ej.
+al inicio de un examen):
+
+- un hilo escritor por proceso recibe las entregas en una cola y las inserta
+  por lotes, cada lote en una sola transacción;
+- la base usa WAL, de modo que las lecturas no esperan a las escrituras;
+- cada entrega lleva una clave de idempotencia: reenviar el mismo formulario
+  no crea una entrega nueva;
+- la tabla ``resumen_notas`` se actualiza en la misma transacción que cada
+  entrega nueva, así la vista del docente lee un resumen ya calculado.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+import pandas as pd
+import streamlit as st
+
+from utils import acceso, cache, catalogo
+
+RUTA_PREGUNTAS = os.path.join("contenido", "evaluaciones.json")
+
+# Un lote se cierra al llegar a este tamaño o tras esta espera desde la primera entrega
+LOTE_MAXIMO = 200
+ESPERA_LOTE_SEGUNDOS = 0.05
+
+NOTA_MAXIMA = 5.0
+NOTA_APROBACION = 3.0
+
+ESPACIO_CACHE = "evaluaciones"
+
+_log = logging.getLogger(__name__)
+
+
+def _conectar():
+    conn = sqlite3.connect(catalogo.ruta("entregas"), timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _crear_tablas(conn):
+    with conn:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS entregas (
+            clave TEXT PRIMARY KEY,
+            momento TEXT NOT NULL,
+            estudiante TEXT NOT NULL,
+            respuestas TEXT NOT NULL,
+            puntaje REAL NOT NULL,
+            fecha TEXT NOT NULL
+        )
+        """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS resumen_notas (
+            momento TEXT PRIMARY KEY,
+            entregas INTEGER NOT NULL,
+            suma REAL NOT NULL,
+            minimo REAL NOT NULL,
+            maximo REAL NOT NULL,
+            aprobados INTEGER NOT NULL
+        )
+        """)
+
+
+class ColaEntregas:
+    """Escritor en segundo plano que inserta las entregas por lotes."""
+
+    def __init__(self):
+        self._cola = queue.Queue()
+        self._conn = _conectar()
+        _crear_tablas(self._conn)
+        self._hilo = threading.Thread(target=self._procesar, name="ntp-entregas", daemon=True)
+        self._hilo.start()
+
+    def enviar(self, entrega):
+        """Encola la entrega; el ``Future`` indica si era nueva (``True``) o repetida."""
+        futuro = Future()
+        self._cola.put((entrega, futuro))
+        return futuro
+
+    def cerrar(self, espera=5):
+        self._cola.put(None)
+        self._hilo.join(espera)
+
+    def _siguiente_lote(self):
+        primero = self._cola.get()
+        if primero is None:
+            return None
+
+        lote = [primero]
+        limite = time.monotonic() + ESPERA_LOTE_SEGUNDOS
+        while len(lote) < LOTE_MAXIMO:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                elemento = self._cola.get(timeout=restante)
+            except queue.Empty:
+                break
+            if elemento is None:
+                # Volver a encolar la señal de cierre para el siguiente ciclo
+                self._cola.put(None)
+                break
+            lote.append(elemento)
+        return lote
+
+    def _procesar(self):
+        while (lote := self._siguiente_lote()) is not None:
+            # Un error aquí no debe detener el hilo: las entregas siguientes se quedarían sin escribir
+            try:
+                self._procesar_lote(lote)
+            except Exception:
+                _log.exception("Error al procesar un lote de %d entregas", len(lote))
+        self._conn.close()
+
+    def _procesar_lote(self, lote):
+        # Una entrega cancelada antes de escribirse se descarta; las demás ya no se pueden cancelar
+        lote = [(entrega, futuro) for entrega, futuro in lote if futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+
+        try:
+            nuevas = self._escribir(lote)
+        except Exception as e:
+            for _, futuro in lote:
+                futuro.set_exception(e)
+            return
+
+        for (_, futuro), nueva in zip(lote, nuevas):
+            futuro.set_result(nueva)
+        cache.obtener_cache().vaciar(ESPACIO_CACHE)
+
+    def _escribir(self, lote):
+        nuevas = []
+        with self._conn:
+            for entrega, _ in lote:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO entregas VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        entrega["clave"], entrega["momento"], entrega["estudiante"],
+                        json.dumps(entrega["respuestas"], ensure_ascii=False),
+                        entrega["puntaje"], entrega["fecha"]
+                    )
+                )
+                nueva = cursor.rowcount == 1
+                nuevas.append(nueva)
+                if nueva:
+                    # Mantener el resumen de forma incremental en la misma transacción
+                    self._conn.execute("""
+                    INSERT INTO resumen_notas VALUES (?, 1, ?, ?, ?, ?)
+                    ON CONFLICT(momento) DO UPDATE SET
+                        entregas = entregas + 1,
+                        suma = suma + excluded.suma,
+                        minimo = MIN(minimo, excluded.minimo),
+                        maximo = MAX(maximo, excluded.maximo),
+                        aprobados = aprobados + excluded.aprobados
+                    """, (
+                        entrega["momento"], entrega["puntaje"], entrega["puntaje"],
+                        entrega["puntaje"], int(entrega["puntaje"] >= NOTA_APROBACION)
+                    ))
+        return nuevas
+
+
+_cola = None
+_bloqueo = threading.Lock()
+
+
+def obtener_cola():
+    global _cola
+    with _bloqueo:
+        if _cola is None:
+            _cola = ColaEntregas()
+            atexit.register(_cola.cerrar)
+        return _cola
+
+
+@st.cache_resource(show_spinner=False)
+def _cargar_preguntas(ruta, version):
+    # ``version`` (mtime) solo forma parte de la clave para recargar si el archivo cambia
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def preguntas(momento):
+    """Evaluación del momento; el archivo se lee una sola vez por proceso."""
+    return _cargar_preguntas(RUTA_PREGUNTAS, os.path.getmtime(RUTA_PREGUNTAS))[momento]
+
+
+def calificar(evaluacion, respuestas):
+    """Nota de 0 a 5 según la proporción de respuestas correctas."""
+    correctas = sum(
+        1 for pregunta in evaluacion["preguntas"]
+        if respuestas.get(pregunta["id"]) == pregunta["opciones"][pregunta["correcta"]]
+    )
+    return round(NOTA_MAXIMA * correctas / len(evaluacion["preguntas"]), 2)
+
+
+def enviar_entrega(clave, momento, estudiante, respuestas, puntaje):
+    return obtener_cola().enviar({
+        "clave": clave,
+        "momento": momento,
+        "estudiante": estudiante,
+        "respuestas": respuestas,
+        "puntaje": puntaje,
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def _leer_resumen(momento):
+    conn = _conectar()
+    try:
+        fila = conn.execute(
+            "SELECT entregas, suma, minimo, maximo, aprobados FROM resumen_notas WHERE momento = ?",
+            (momento,)
+        ).fetchone()
+        entregas = pd.read_sql(
+            "SELECT estudiante, puntaje, fecha FROM entregas WHERE momento = ? ORDER BY fecha DESC LIMIT 50",
+            conn, params=(momento,)
+        )
+    finally:
+        conn.close()
+
+    if fila is None:
+        return None
+    total, suma, minimo, maximo, aprobados = fila
+    return {
+        "entregas": total,
+        "promedio": suma / total,
+        "minimo": minimo,
+        "maximo": maximo,
+        "aprobados": aprobados,
+        "recientes": entregas,
+    }
+
+
+def resumen(momento):
+    """Resumen de notas del momento; se guarda unos segundos en la caché compartida
+    (otros procesos del servidor también escriben en la base)."""
+    obtener_cola()  # asegura que las tablas existan
+    return cache.obtener_cache().obtener(ESPACIO_CACHE, ("resumen", momento), lambda: _leer_resumen(momento), ttl=5)
+
+
+# --------------------------------------------------
+# Interfaz de la página de evaluación
+# --------------------------------------------------
+
+def renderizar_evaluacion(momento):
+    evaluacion = preguntas(momento)
+    st.header(evaluacion["titulo"])
+
+    # Una clave por formulario y sesión: reenviarlo no duplica la entrega
+    clave_sesion = f"clave_entrega_{momento}"
+    if clave_sesion not in st.session_state:
+        st.session_state[clave_sesion] = uuid.uuid4().hex
+    enviada_sesion = f"entrega_enviada_{momento}"
+
+    if st.session_state.get(enviada_sesion):
+        st.success(f"✅ Tu entrega fue registrada. Nota: {st.session_state[enviada_sesion]:.2f} / {NOTA_MAXIMA:.0f}")
+    else:
+        with st.form(f"evaluacion_{momento}"):
+            estudiante = st.text_input("Nombre completo")
+            respuestas = {}
+            for numero, pregunta in enumerate(evaluacion["preguntas"], start=1):
+                respuestas[pregunta["id"]] = st.radio(
+                    f"{numero}. {pregunta['enunciado']}", pregunta["opciones"], index=None
+                )
+            enviado = st.form_submit_button("📤 Enviar evaluación")
+
+        if enviado:
+            if not estudiante.strip():
+                st.warning("Por favor escribe tu nombre antes de enviar")
+            elif None in respuestas.values():
+                st.warning("Por favor responde todas las preguntas")
+            else:
+                puntaje = calificar(evaluacion, respuestas)
+                futuro = enviar_entrega(
+                    st.session_state[clave_sesion], momento, estudiante.strip(), respuestas, puntaje
+                )
+                try:
+                    futuro.result(timeout=30)
+                except Exception as e:
+                    st.error(f"❌ No se pudo registrar la entrega: {e}")
+                else:
+                    st.session_state[enviada_sesion] = puntaje
+                    st.rerun()
+
+    with st.expander("👩‍🏫 Vista del docente"):
+        if not acceso.es_docente(f"docente_{momento}"):
+            return
+
+        datos = resumen(momento)
+        if datos is None:
+            st.info("Todavía no hay entregas.")
+            return
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entregas", datos["entregas"])
+        col2.metric("Promedio", f"{datos['promedio']:.2f}")
+        col3.metric("Rango", f"{datos['minimo']:.1f} - {datos['maximo']:.1f}")
+        col4.metric("Aprobados", f"{datos['aprobados']} ({datos['aprobados'] / datos['entregas']:.0%})")
+        st.subheader("Entregas recientes")
+        st.dataframe(datos["recientes"], use_container_width=True, hide_index=True)
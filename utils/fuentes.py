@@ -0,0 +1,91 @@
+"""Cargadores de las fuentes de datos de M2 Actividad 1.
+
+Cada función crea el archivo de ejemplo si no existe y devuelve el DataFrame
+leído. Las rutas por defecto se toman del catálogo de datasets. Están a nivel
+de módulo para poder ejecutarse en el pool de procesos.
+"""
+
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from utils import catalogo
+
+
+def cargar_exportaciones(ruta=None):
+    ruta = ruta or catalogo.ruta("exportaciones")
+    # Crear archivo CSV de ejemplo si no existe
+    if not os.path.exists(ruta):
+        datos_export = {
+            "Producto": ["Café", "Petróleo", "Flores", "Banano"],
+            "Valor (USD millones)": [2850, 12500, 1500, 850],
+            "Destino principal": ["EE.UU.", "EE.UU.", "EE.UU.", "Europa"]
+        }
+        pd.DataFrame(datos_export).to_csv(ruta, index=False)
+
+    return pd.read_csv(ruta)
+
+
+def cargar_economia(ruta=None):
+    ruta = ruta or catalogo.ruta("economia")
+    # Crear archivo Excel de ejemplo si no existe
+    if not os.path.exists(ruta):
+        datos_econ = {
+            "Año": [2019, 2020, 2021],
+            "PIB (billones COP)": [1100, 990, 1150],
+            "Inflación (%)": [3.5, 2.5, 5.0]
+        }
+        pd.DataFrame(datos_econ).to_excel(ruta, index=False)
+
+    return pd.read_excel(ruta)
+
+
+def cargar_patrimonio(ruta=None):
+    ruta = ruta or catalogo.ruta("patrimonio")
+    # Crear archivo JSON de ejemplo si no existe
+    if not os.path.exists(ruta):
+        patrimonio = [
+            {"Nombre": "Carnaval de Barranquilla", "Tipo": "Inmaterial", "Año declaración": 2003},
+            {"Nombre": "Parque Arqueológico de San Agustín", "Tipo": "Material", "Año declaración": 1995}
+        ]
+        with open(ruta, "w") as f:
+            json.dump(patrimonio, f)
+
+    return pd.read_json(ruta)
+
+
+def cargar_colegios(ruta=None):
+    ruta = ruta or catalogo.ruta("colegios")
+    conn = sqlite3.connect(ruta)
+    try:
+        cursor = conn.cursor()
+
+        # Crear tabla si no existe
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS colegios (
+            id INTEGER PRIMARY KEY,
+            nombre TEXT,
+            estudiantes INTEGER,
+            municipio TEXT
+        )
+        """)
+
+        # Insertar datos de ejemplo si la tabla está vacía
+        if cursor.execute("SELECT COUNT(*) FROM colegios").fetchone()[0] == 0:
+            datos_colegios = [
+                (1, "Liceo Nacional", 1200, "Bogotá"),
+                (2, "INEM", 950, "Cali"),
+                (3, "Normal Superior", 800, "Medellín")
+            ]
+            cursor.executemany("INSERT OR IGNORE INTO colegios VALUES (?, ?, ?, ?)", datos_colegios)
+            conn.commit()
+
+        return pd.read_sql("SELECT nombre, estudiantes, municipio FROM colegios", conn)
+    finally:
+        conn.close()
+
+
+def cargar_url(url):
+    return pd.read_csv(url)
@@ -0,0 +1,185 @@
+"""Instantáneas compactas de poblaciones sintéticas en Parquet.
+
+La población de M2 Actividad 3 se regeneraba con Faker en cada ejecución. Aquí
+se persiste en un archivo Parquet comprimido con zstd donde:
+
+- las cadenas se guardan codificadas como diccionario (categorías),
+- las fechas se guardan como ``date32`` (días desde 1970 en un int32),
+- los booleanos quedan empaquetados a nivel de bit por Arrow/Parquet,
+- los enteros se reducen al tipo más pequeño que los contiene.
+
+Al leer se puede pedir solo un subconjunto de columnas, de modo que los
+filtros activos no pagan por las columnas que no usan.
+
+El nombre del archivo incluye la versión del formato y un hash del código del
+generador: si cambia ``utils/poblacion.py`` se genera una instantánea nueva.
+
+Para generar una instantánea de prueba de carga::
+
+    python -m utils.instantanea --filas 10000000 --salida poblacion_10M.parquet
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DIRECTORIO_INSTANTANEAS = os.path.join(".cache", "poblaciones")
+
+# Filas por grupo de filas en Parquet; permite leer por partes archivos grandes
+FILAS_POR_GRUPO = 1_000_000
+
+# Cambiar al modificar la forma en que se codifican las columnas
+VERSION_FORMATO = 1
+
+# Columnas que necesita cada filtro de la Actividad 3. Los filtros por fecha se
+# resuelven con los índices de ``utils.temporal`` y no necesitan columnas propias.
+COLUMNAS_POR_FILTRO = {
+    "edad": ["edad"],
+    "municipios": ["municipio"],
+    "ingreso_minimo": ["ingreso_mensual"],
+    "ocupacion": ["ocupacion"],
+    "vivienda": ["tipo_vivienda"],
+    "nombre": ["nombre_completo"],
+    "anio_nacimiento": [],
+    "internet": ["acceso_internet"],
+    "ingresos_nulos": ["ingreso_mensual"],
+    "rango_fechas": [],
+    "grupo_edad": [],
+}
+
+
+def _columna_arrow(serie):
+    if pd.api.types.is_bool_dtype(serie):
+        return pa.array(serie, type=pa.bool_())
+
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return pa.array(serie, from_pandas=True).cast(pa.date32())
+
+    if pd.api.types.is_integer_dtype(serie):
+        return pa.array(pd.to_numeric(serie, downcast="integer"))
+
+    if pd.api.types.is_float_dtype(serie):
+        valores = serie.dropna()
+        # Enteros con nulos (p. ej. ingreso_mensual) se guardan como int32 anulable
+        if len(valores) and np.array_equal(valores, valores.round()) \
+                and valores.abs().max() < np.iinfo(np.int32).max:
+            return pa.array(serie, from_pandas=True).cast(pa.int32())
+        return pa.array(serie, from_pandas=True)
+
+    # Cadenas y categorías: codificación por diccionario
+    return pa.array(serie.astype("string"), from_pandas=True).dictionary_encode()
+
+
+def a_tabla(df):
+    """Convierte el DataFrame a una tabla Arrow con tipos compactos."""
+    columnas = [_columna_arrow(df[nombre]) for nombre in df.columns]
+    return pa.Table.from_arrays(columnas, names=list(df.columns))
+
+
+def guardar(df, ruta):
+    """Escribe la instantánea en ``ruta`` (Parquet + zstd)."""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+
+    # Escribir en un temporal y renombrar para no dejar archivos a medias
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(
+        a_tabla(df),
+        temporal,
+        compression="zstd",
+        use_dictionary=True,
+        row_group_size=FILAS_POR_GRUPO
+    )
+    os.replace(temporal, ruta)
+
+
+def cargar(ruta, columnas=None):
+    """Lee la instantánea; con ``columnas`` solo se leen esas columnas."""
+    tabla = pq.read_table(ruta, columns=columnas)
+    # Las columnas de diccionario llegan a pandas como categorías
+    return tabla.to_pandas(date_as_object=False)
+
+
+def columnas_para_filtros(filtros):
+    """Columnas necesarias para evaluar los filtros indicados."""
+    columnas = ["id"]
+    for filtro in filtros:
+        for columna in COLUMNAS_POR_FILTRO[filtro]:
+            if columna not in columnas:
+                columnas.append(columna)
+    return columnas
+
+
+def version_generador():
+    """Versión del formato más un hash del código de ``utils.poblacion``."""
+    from utils import poblacion as generador
+
+    with open(generador.__file__, "rb") as f:
+        codigo = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"v{VERSION_FORMATO}-{codigo}"
+
+
+def ruta_poblacion(n, semilla):
+    return os.path.join(
+        DIRECTORIO_INSTANTANEAS, f"poblacion_n{n}_s{semilla}_{version_generador()}.parquet"
+    )
+
+
+def asegurar_poblacion(n, semilla=123):
+    """Ruta de la instantánea de la población, generándola la primera vez."""
+    from utils import poblacion as generador
+
+    ruta = ruta_poblacion(n, semilla)
+    if not os.path.exists(ruta):
+        guardar(generador.generar_poblacion_paralela(n, semilla), ruta)
+    return ruta
+
+
+def esquema(ruta):
+    """Nombres de las columnas de la instantánea, leídos de sus metadatos."""
+    return pq.read_schema(ruta).names
+
+
+def poblacion(n, semilla=123, columnas=None):
+    """Carga la población desde su instantánea, generándola la primera vez."""
+    return cargar(asegurar_poblacion(n, semilla), columnas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera y mide una instantánea de población")
+    parser.add_argument("--filas", type=int, default=10_000_000)
+    parser.add_argument("--semilla", type=int, default=123)
+    parser.add_argument("--salida", default=None)
+    parser.add_argument("--columnas", nargs="*", default=None,
+                        help="Columnas a leer al medir la carga")
+    args = parser.parse_args()
+
+    from utils import poblacion as generador
+
+    salida = args.salida or ruta_poblacion(args.filas, args.semilla)
+
+    inicio = time.perf_counter()
+    df = generador.generar_poblacion_paralela(args.filas, args.semilla)
+    print(f"Generación: {time.perf_counter() - inicio:.1f} s")
+
+    inicio = time.perf_counter()
+    guardar(df, salida)
+    print(f"Escritura: {time.perf_counter() - inicio:.1f} s, "
+          f"{os.path.getsize(salida) / 1e6:.1f} MB en {salida}")
+
+    inicio = time.perf_counter()
+    leido = cargar(salida, args.columnas)
+    print(f"Lectura: {time.perf_counter() - inicio:.2f} s, "
+          f"{leido.memory_usage(deep=True).sum() / 1e6:.1f} MB en memoria")
+
+
+if __name__ == "__main__":
+    main()
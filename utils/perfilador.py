@@ -0,0 +1,98 @@
+"""Perfil de calidad de datos calculado en segundo plano.
+
+``perfilar`` calcula en una sola pasada vectorizada, columna a columna, los
+nulos, la cardinalidad, los valores atípicos (regla de 1,5 × IQR) y los
+histogramas de las columnas numéricas y de fecha. ``perfil_en_segundo_plano``
+lo lanza fuera del hilo de la página y guarda el resultado en la caché
+compartida por versión del dataset, de modo que solo se calcula una vez.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from utils import cache
+
+ESPACIO_CACHE = "perfiles"
+INTERVALOS_HISTOGRAMA = 20
+
+
+def version_df(df):
+    """Hash del contenido del DataFrame, para cuando no hay una versión explícita."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=True).values.tobytes()).hexdigest()
+
+
+def _histograma(valores, intervalos):
+    valores = valores[~np.isnan(valores)]
+    if len(valores) == 0:
+        return None
+    conteos, bordes = np.histogram(valores, bins=intervalos)
+    return {"conteos": conteos, "bordes": bordes}
+
+
+def perfilar(df, intervalos=INTERVALOS_HISTOGRAMA):
+    """Perfil de calidad de ``df``.
+
+    Devuelve un diccionario con el número de filas, un DataFrame ``columnas``
+    con una fila por columna y los histogramas por columna.
+    """
+    filas = len(df)
+    nulos = df.isna().sum()
+    cardinalidad = df.nunique(dropna=True)
+
+    # Los booleanos no tienen sentido como numéricos para atípicos e histogramas
+    numericas = df.select_dtypes(include="number").select_dtypes(exclude="bool")
+    fechas = df.select_dtypes(include="datetime")
+
+    cuartiles = numericas.quantile([0.25, 0.75])
+    rango = cuartiles.loc[0.75] - cuartiles.loc[0.25]
+    limite_inferior = cuartiles.loc[0.25] - 1.5 * rango
+    limite_superior = cuartiles.loc[0.75] + 1.5 * rango
+    atipicos = numericas.lt(limite_inferior).sum() + numericas.gt(limite_superior).sum()
+
+    columnas = pd.DataFrame({
+        "tipo": df.dtypes.astype(str),
+        "nulos": nulos,
+        "% nulos": (nulos / filas * 100).round(2) if filas else 0.0,
+        "cardinalidad": cardinalidad,
+        "atípicos": atipicos.reindex(df.columns),
+        "mínimo": numericas.min().reindex(df.columns),
+        "máximo": numericas.max().reindex(df.columns),
+    })
+    columnas.index.name = "columna"
+
+    histogramas = {}
+    for columna in numericas.columns:
+        histogramas[columna] = _histograma(numericas[columna].to_numpy(dtype="float64"), intervalos)
+    for columna in fechas.columns:
+        # Las fechas se agrupan por año de nacimiento
+        anios = fechas[columna].dt.year.to_numpy(dtype="float64")
+        histogramas[columna] = _histograma(anios, intervalos)
+
+    return {"filas": filas, "columnas": columnas, "histogramas": histogramas}
+
+
+def _cargar_y_perfilar(cargar):
+    return perfilar(cargar())
+
+
+def perfil_en_segundo_plano(df, nombre, version=None):
+    """Devuelve un ``Future`` con el perfil de ``df``.
+
+    El cálculo corre en el pool de hilos (comparte memoria con la página, sin
+    copiar el DataFrame) y el resultado queda en caché para ``version``.
+    ``df`` también puede ser una función sin argumentos que devuelve el
+    DataFrame: así la carga ocurre en segundo plano y solo si el perfil no está
+    en caché (en ese caso ``version`` es obligatoria).
+    """
+    if callable(df):
+        if version is None:
+            raise ValueError("Se necesita 'version' para perfilar un DataFrame que aún no está cargado")
+        return cache.obtener_cache().obtener_futuro(
+            ESPACIO_CACHE, nombre, _cargar_y_perfilar, df, hilo=True, version=version
+        )
+    version = version or version_df(df)
+    return cache.obtener_cache().obtener_futuro(
+        ESPACIO_CACHE, nombre, perfilar, df, hilo=True, version=version
+    )
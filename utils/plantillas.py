@@ -0,0 +1,92 @@
+"""Motor de plantillas para las páginas de actividades y evaluaciones.
+
+El contenido de cada página se define como datos en
+``contenido/actividades.json``: un título, un icono y una lista de secciones.
+Las secciones repetidas entre páginas se definen una vez en
+``secciones_comunes`` y se referencian con ``{"ref": "nombre"}``.
+
+Tipos de sección:
+
+- ``encabezado``: solo un ``st.header``.
+- ``markdown``: encabezado opcional y texto en Markdown.
+- ``modulo``: contenido pesado o interactivo; el módulo indicado se importa
+  solo cuando la sección se muestra y se llama a su ``funcion`` con ``argumentos``.
+
+El archivo se lee y se resuelve una sola vez por proceso (hasta que cambie en
+disco), de modo que cada ejecución de la página solo emite los elementos.
+"""
+
+import importlib
+import json
+import os
+
+import streamlit as st
+
+from utils import registro
+
+RUTA_CONTENIDO = os.path.join("contenido", "actividades.json")
+
+
+@st.cache_resource(show_spinner=False)
+def _cargar_paginas(ruta, version):
+    # ``version`` (mtime) solo forma parte de la clave para recargar si el archivo cambia
+    with open(ruta, encoding="utf-8") as f:
+        contenido = json.load(f)
+
+    comunes = contenido.get("secciones_comunes", {})
+    paginas = {}
+    for clave, pagina in contenido["paginas"].items():
+        secciones = [comunes[seccion["ref"]] if "ref" in seccion else seccion
+                     for seccion in pagina.get("secciones", [])]
+        paginas[clave] = {**pagina, "secciones": tuple(secciones)}
+    return paginas
+
+
+def paginas():
+    """Páginas definidas en el archivo de contenido, con las referencias resueltas."""
+    return _cargar_paginas(RUTA_CONTENIDO, os.path.getmtime(RUTA_CONTENIDO))
+
+
+def _encabezado(seccion):
+    st.header(seccion["titulo"])
+
+
+def _markdown(seccion):
+    if seccion.get("titulo"):
+        st.header(seccion["titulo"])
+    st.markdown(seccion["contenido"])
+
+
+def _modulo(seccion):
+    if seccion.get("titulo"):
+        st.header(seccion["titulo"])
+    modulo = importlib.import_module(seccion["modulo"])
+    getattr(modulo, seccion["funcion"])(**seccion.get("argumentos", {}))
+
+
+_RENDERIZADORES = {
+    "encabezado": _encabezado,
+    "markdown": _markdown,
+    "modulo": _modulo,
+}
+
+
+def renderizar(clave):
+    """Muestra la página ``clave`` del archivo de contenido."""
+    pagina = paginas()[clave]
+
+    # Configuración de la página
+    st.set_page_config(
+        page_title=pagina["titulo"],
+        page_icon=pagina.get("icono", "📌"),
+        layout="wide"
+    )
+
+    medicion = registro.iniciar(clave)
+
+    st.title(pagina["titulo"])
+
+    for seccion in pagina["secciones"]:
+        _RENDERIZADORES[seccion["tipo"]](seccion)
+
+    medicion.finalizar()
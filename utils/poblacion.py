@@ -0,0 +1,91 @@
+"""Generación de la población sintética de M2 Actividad 3.
+
+La generación con Faker es costosa, así que para poblaciones grandes se reparte
+en fragmentos independientes que se generan en el pool de procesos.
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+from faker import Faker  # type: ignore
+
+from utils import ejecutor
+
+REGIONES = ['Caribe', 'Andina', 'Pacífica', 'Orinoquía', 'Amazonía']
+PESOS_REGIONES = [0.3, 0.4, 0.15, 0.1, 0.05]
+
+MUNICIPIOS = [
+    'Barranquilla', 'Santa Marta', 'Cartagena',  # Caribe
+    'Bogotá', 'Medellín', 'Tunja', 'Manizales',  # Andina
+    'Cali', 'Quibdó', 'Buenaventura',           # Pacífica
+    'Villavicencio', 'Yopal',                    # Orinoquía
+    'Leticia', 'Puerto Inírida'                  # Amazonía
+]
+
+OCUPACIONES = [
+    'Estudiante', 'Docente', 'Comerciante', 'Agricultor',
+    'Ingeniero', 'Médico', 'Desempleado', 'Pensionado',
+    'Emprendedor', 'Obrero'
+]
+
+TIPOS_VIVIENDA = ['Propia', 'Arrendada', 'Familiar']
+
+# Por debajo de este tamaño no compensa repartir el trabajo entre procesos
+FILAS_POR_FRAGMENTO = 50_000
+
+
+def _generar_fragmento(inicio, n, semilla):
+    """Genera ``n`` registros con ids consecutivos desde ``inicio``."""
+    # Configurar Faker para Colombia
+    fake = Faker('es_CO')
+
+    # Establecer semilla para reproducibilidad
+    np.random.seed(semilla)
+    random.seed(semilla)
+    fake.seed_instance(semilla)
+
+    data = {
+        'id': range(inicio, inicio + n),
+        'nombre_completo': [fake.name() for _ in range(n)],
+        'edad': np.random.randint(15, 76, n),
+        'region': random.choices(REGIONES, weights=PESOS_REGIONES, k=n),
+        'municipio': random.choices(MUNICIPIOS, k=n),
+        'ingreso_mensual': np.random.randint(800000, 12000001, n),
+        'ocupacion': random.choices(OCUPACIONES, k=n),
+        'tipo_vivienda': random.choices(TIPOS_VIVIENDA, k=n),
+        'fecha_nacimiento': [
+            fake.date_of_birth(minimum_age=15, maximum_age=75) for _ in range(n)
+        ],
+        'acceso_internet': random.choices([True, False], weights=[0.7, 0.3], k=n)
+    }
+
+    df = pd.DataFrame(data)
+
+    # Convertir fecha_nacimiento a datetime
+    df['fecha_nacimiento'] = pd.to_datetime(df['fecha_nacimiento'])
+    return df
+
+
+def generar_poblacion(n, semilla=123):
+    """Genera la población completa en el proceso actual."""
+    return _generar_fragmento(1, n, semilla)
+
+
+def generar_poblacion_paralela(n, semilla=123, filas_por_fragmento=FILAS_POR_FRAGMENTO):
+    """Genera la población repartiéndola en fragmentos entre los núcleos.
+
+    Cada fragmento usa la semilla ``semilla + i``, de modo que el resultado es
+    reproducible. Si la población cabe en un fragmento se genera en el proceso
+    actual y coincide exactamente con ``generar_poblacion``.
+    """
+    if n <= filas_por_fragmento:
+        return generar_poblacion(n, semilla)
+
+    argumentos = []
+    for i, inicio in enumerate(range(0, n, filas_por_fragmento)):
+        tamano = min(filas_por_fragmento, n - inicio)
+        argumentos.append((inicio + 1, tamano, semilla + i))
+
+    fragmentos = ejecutor.mapear(_generar_fragmento, argumentos)
+    return pd.concat(fragmentos, ignore_index=True)
@@ -0,0 +1,320 @@
+"""Registro de interacciones para telemetría de rendimiento.
+
+Cada ejecución de una página instrumentada genera un registro con la página,
+los widgets que cambiaron desde la ejecución anterior, la duración y las filas
+devueltas. Los registros se encolan y un hilo los escribe por lotes en
+segmentos JSONL, así la página nunca espera una escritura.
+
+Cada segmento rota por tamaño o antigüedad. Al rotar, el proceso que lo
+escribía le añade el sufijo ``.cerrado``: desde ese momento nadie más escribe
+en él. La compactación toma esos segmentos, de modo que puede ejecutarse en
+otro proceso (o con varios servidores) sin perder registros, los junta en
+archivos Parquet y los borra. También toma los segmentos activos abandonados
+por un proceso que terminó sin cerrarlos (ver ``EDAD_ABANDONO_SEGUNDOS``)::
+
+    python -m utils.registro --compactar
+
+Uso en una página::
+
+    medicion = registro.iniciar("m2_actividad3")
+    ...
+    medicion.finalizar(filas=len(df_filtrado))
+"""
+
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+DIRECTORIO = os.path.join("logs", "interacciones")
+DIRECTORIO_PARQUET = os.path.join(DIRECTORIO, "parquet")
+
+MAX_BYTES_SEGMENTO = 8 * 1024 * 1024
+LOTE_MAXIMO = 500
+INTERVALO_ESCRITURA_SEGUNDOS = 1.0
+
+# Un segmento se cierra al llegar a este tamaño o a esta antigüedad
+EDAD_MAXIMA_SEGMENTO_SEGUNDOS = 60
+
+# Un escritor vivo cierra su segmento poco después de EDAD_MAXIMA_SEGMENTO_SEGUNDOS;
+# un segmento activo sin cambios durante el doble quedó abandonado
+EDAD_ABANDONO_SEGUNDOS = 2 * EDAD_MAXIMA_SEGMENTO_SEGUNDOS
+
+SUFIJO_CERRADO = ".cerrado"
+
+# Tipos de valores de session_state que se comparan para detectar cambios
+_TIPOS_WIDGET = (str, int, float, bool, tuple, list, date, type(None))
+
+
+class EscritorSegmentos:
+    """Hilo que agrupa registros y los añade al segmento JSONL activo."""
+
+    def __init__(self, directorio=DIRECTORIO, max_bytes=MAX_BYTES_SEGMENTO):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self._cola = queue.Queue()
+        self._segmento = None
+        self._apertura = 0.0
+        self._consecutivo = 0
+        os.makedirs(directorio, exist_ok=True)
+        self._hilo = threading.Thread(target=self._procesar, name="ntp-registro", daemon=True)
+        self._hilo.start()
+
+    def registrar(self, registro):
+        self._cola.put(registro)
+
+    def cerrar(self, espera=5):
+        self._cola.put(None)
+        self._hilo.join(espera)
+
+    @property
+    def segmento_activo(self):
+        return self._segmento
+
+    def _nuevo_segmento(self):
+        self._consecutivo += 1
+        marca = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segmento = os.path.join(
+            self.directorio, f"segmento-{marca}-{os.getpid()}-{self._consecutivo:04d}.jsonl"
+        )
+        self._apertura = time.monotonic()
+
+    def _cerrar_segmento(self):
+        """Marca el segmento activo como cerrado; el siguiente lote abre otro."""
+        if self._segmento is not None and os.path.exists(self._segmento):
+            os.replace(self._segmento, self._segmento + SUFIJO_CERRADO)
+        self._segmento = None
+
+    def _rotar_si_corresponde(self):
+        if self._segmento is None:
+            return
+        vencido = time.monotonic() - self._apertura >= EDAD_MAXIMA_SEGMENTO_SEGUNDOS
+        lleno = os.path.exists(self._segmento) and os.path.getsize(self._segmento) >= self.max_bytes
+        if vencido or lleno:
+            self._cerrar_segmento()
+
+    def _procesar(self):
+        activo = True
+        while activo:
+            lote = []
+            limite = time.monotonic() + INTERVALO_ESCRITURA_SEGUNDOS
+            while len(lote) < LOTE_MAXIMO:
+                try:
+                    registro = self._cola.get(timeout=max(limite - time.monotonic(), 0.01))
+                except queue.Empty:
+                    break
+                if registro is None:
+                    activo = False
+                    break
+                lote.append(registro)
+            try:
+                # También sin registros nuevos, para que un segmento viejo quede listo para compactar
+                self._rotar_si_corresponde()
+                if lote:
+                    self._escribir(lote)
+                if not activo:
+                    self._cerrar_segmento()
+            except OSError:
+                # La telemetría nunca debe tumbar la aplicación
+                pass
+
+    def _escribir(self, lote):
+        if self._segmento is None:
+            self._nuevo_segmento()
+        with open(self._segmento, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in lote))
+
+
+_escritor = None
+_bloqueo = threading.Lock()
+
+
+def obtener_escritor():
+    global _escritor
+    with _bloqueo:
+        if _escritor is None:
+            _escritor = EscritorSegmentos()
+            atexit.register(_escritor.cerrar)
+        return _escritor
+
+
+class Medicion:
+    """Mide una ejecución de página; se crea con ``iniciar``."""
+
+    def __init__(self, pagina, sesion, widgets):
+        self.pagina = pagina
+        self.sesion = sesion
+        self.widgets = widgets
+        self.inicio = time.perf_counter()
+
+    def finalizar(self, filas=None):
+        obtener_escritor().registrar({
+            "fecha": datetime.now().isoformat(timespec="milliseconds"),
+            "sesion": self.sesion,
+            "pagina": self.pagina,
+            "widgets": self.widgets,
+            "duracion_ms": round((time.perf_counter() - self.inicio) * 1000, 2),
+            "filas": filas,
+        })
+
+
+def iniciar(pagina):
+    """Empieza a medir la ejecución actual de ``pagina``.
+
+    Los widgets cambiados se detectan comparando los valores con clave de
+    ``st.session_state`` con los de la ejecución anterior de la misma página.
+    """
+    import streamlit as st
+
+    if "_registro_sesion" not in st.session_state:
+        st.session_state["_registro_sesion"] = uuid.uuid4().hex[:12]
+
+    estado = {
+        clave: valor for clave, valor in st.session_state.items()
+        if not clave.startswith("_") and isinstance(valor, _TIPOS_WIDGET)
+    }
+    anteriores = st.session_state.setdefault("_registro_estado", {})
+    anterior = anteriores.get(pagina, {})
+    cambiados = sorted(
+        clave for clave in estado.keys() | anterior.keys()
+        if estado.get(clave) != anterior.get(clave)
+    )
+    anteriores[pagina] = estado
+
+    return Medicion(pagina, st.session_state["_registro_sesion"], cambiados)
+
+
+# --------------------------------------------------
+# Compactación y análisis
+# --------------------------------------------------
+
+def _segmentos_abandonados():
+    """Segmentos activos sin cambios desde hace ``EDAD_ABANDONO_SEGUNDOS``.
+
+    Son los de un proceso que terminó sin cerrarlos (p. ej. al matarlo, sin
+    pasar por ``atexit``). El segmento activo del escritor de este proceso
+    nunca se toma.
+    """
+    propio = _escritor.segmento_activo if _escritor is not None else None
+    limite = time.time() - EDAD_ABANDONO_SEGUNDOS
+    abandonados = []
+    for ruta in glob.glob(os.path.join(DIRECTORIO, "segmento-*.jsonl")):
+        try:
+            if ruta != propio and os.path.getmtime(ruta) < limite:
+                abandonados.append(ruta)
+        except OSError:
+            continue
+    return abandonados
+
+
+def _reclamar_segmentos():
+    """Renombra para este proceso los segmentos cerrados y los abandonados, y
+    devuelve sus rutas nuevas.
+
+    El renombrado es atómico: si dos compactaciones coinciden, cada segmento
+    lo toma solo una de ellas.
+    """
+    reclamados = []
+    cerrados = glob.glob(os.path.join(DIRECTORIO, f"segmento-*.jsonl{SUFIJO_CERRADO}"))
+    for ruta in sorted(cerrados + _segmentos_abandonados()):
+        destino = f"{ruta}.{os.getpid()}"
+        try:
+            os.rename(ruta, destino)
+        except OSError:
+            continue
+        reclamados.append(destino)
+    return reclamados
+
+
+def _leer_registros(ruta):
+    registros = []
+    try:
+        with open(ruta, encoding="utf-8", errors="replace") as f:
+            for linea in f:
+                try:
+                    registros.append(json.loads(linea))
+                except ValueError:
+                    # Última línea a medio escribir (segmento activo) o cortada
+                    # porque el proceso terminó mientras escribía
+                    continue
+    except FileNotFoundError:
+        # Se cerró, reclamó o compactó entre el listado y la lectura
+        pass
+    return registros
+
+
+def _leer_segmentos(rutas):
+    import pandas as pd
+
+    registros = [registro for ruta in rutas for registro in _leer_registros(ruta)]
+    if not registros:
+        return None
+    df = pd.DataFrame(registros)
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    df["widgets"] = df["widgets"].map(lambda widgets: ",".join(widgets or []))
+    df["filas"] = pd.to_numeric(df["filas"], errors="coerce").astype("Int64")
+    return df
+
+
+def compactar():
+    """Convierte los segmentos cerrados en un archivo Parquet y los borra.
+
+    Los segmentos activos (sin el sufijo ``.cerrado``) no se tocan, salvo los
+    abandonados. Devuelve el número de registros compactados.
+    """
+    segmentos = _reclamar_segmentos()
+    df = _leer_segmentos(segmentos)
+    if df is not None:
+        os.makedirs(DIRECTORIO_PARQUET, exist_ok=True)
+        marca = datetime.now().strftime("%Y%m%d-%H%M%S")
+        destino = os.path.join(DIRECTORIO_PARQUET, f"interacciones-{marca}-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet")
+        df.to_parquet(destino, compression="zstd", index=False)
+    for ruta in segmentos:
+        os.remove(ruta)
+    return 0 if df is None else len(df)
+
+
+def cargar_interacciones(columnas=None):
+    """Todos los registros: los ya compactados en Parquet y los segmentos pendientes."""
+    import pandas as pd
+
+    marcos = [
+        pd.read_parquet(ruta, columns=columnas)
+        for ruta in sorted(glob.glob(os.path.join(DIRECTORIO_PARQUET, "*.parquet")))
+    ]
+    # Segmentos activos, cerrados y los que se están compactando
+    pendientes = _leer_segmentos(sorted(glob.glob(os.path.join(DIRECTORIO, "segmento-*.jsonl*"))))
+    if pendientes is not None:
+        marcos.append(pendientes[columnas] if columnas else pendientes)
+    if not marcos:
+        return None
+    return pd.concat(marcos, ignore_index=True)
+
+
+def percentiles_por_pagina(df):
+    """Latencia por página: ejecuciones, p50, p90, p99 y filas promedio."""
+    agrupado = df.groupby("pagina")
+    resumen = agrupado["duracion_ms"].quantile([0.5, 0.9, 0.99]).unstack()
+    resumen.columns = ["p50_ms", "p90_ms", "p99_ms"]
+    resumen.insert(0, "ejecuciones", agrupado.size())
+    resumen["filas_promedio"] = agrupado["filas"].mean()
+    return resumen.sort_values("p90_ms", ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento del registro de interacciones")
+    parser.add_argument("--compactar", action="store_true", help="Compacta los segmentos cerrados en Parquet")
+    args = parser.parse_args()
+
+    if args.compactar:
+        print(f"Registros compactados: {compactar()}")
+
+
+if __name__ == "__main__":
+    main()
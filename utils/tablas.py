@@ -0,0 +1,122 @@
+"""Lectura por columnas de los datasets del catálogo.
+
+Cada vista pide solo las columnas que necesita. Las columnas que aún no están
+en memoria se leen del archivo con la proyección propia de cada formato
+(``usecols`` en CSV/Excel, ``columns`` en Parquet, lista de ``SELECT`` en
+SQLite) y se añaden a la tabla en memoria, de modo que una columna se lee como
+máximo una vez por versión del archivo.
+
+Las columnas leídas se guardan juntas, en un solo DataFrame, en la caché
+compartida con la versión del archivo: cuentan para su límite de memoria, se
+ven en la página de administración y, con el nivel en disco activado, siguen
+disponibles tras un reinicio.
+"""
+
+import functools
+import sqlite3
+import threading
+
+import pandas as pd
+
+from utils import cache, catalogo
+
+ESPACIO_CACHE = "tablas"
+
+
+def _leer_csv(nombre, columnas):
+    return pd.read_csv(catalogo.ruta(nombre), usecols=columnas)
+
+
+def _leer_excel(nombre, columnas):
+    return pd.read_excel(catalogo.ruta(nombre), usecols=columnas)
+
+
+def _leer_parquet(nombre, columnas):
+    return pd.read_parquet(catalogo.ruta(nombre), columns=columnas)
+
+
+def _leer_json(nombre, columnas):
+    # JSON no permite leer solo algunas columnas
+    return pd.read_json(catalogo.ruta(nombre))[columnas]
+
+
+def _leer_sqlite(nombre, columnas):
+    tabla = catalogo.entrada(nombre)["tabla"]
+    lista = ", ".join('"' + columna.replace('"', '""') + '"' for columna in columnas)
+    conn = sqlite3.connect(catalogo.ruta(nombre))
+    try:
+        # Ordenar por rowid para que lecturas separadas queden alineadas
+        return pd.read_sql(f"SELECT {lista} FROM {tabla} ORDER BY rowid", conn)
+    finally:
+        conn.close()
+
+
+_LECTORES = {
+    "csv": _leer_csv,
+    "excel": _leer_excel,
+    "parquet": _leer_parquet,
+    "json": _leer_json,
+    "sqlite": _leer_sqlite,
+}
+
+# Serializa las lecturas para que dos sesiones no lean a la vez las mismas columnas
+_bloqueo_lectura = threading.Lock()
+
+
+class TablaProyectada:
+    """Columnas de un dataset cargadas a demanda para una versión del archivo.
+
+    ``leer(columnas)`` devuelve un DataFrame con esas columnas, alineado por
+    filas con las lecturas anteriores.
+    """
+
+    def __init__(self, nombre, version, esquema, leer):
+        self.nombre = nombre
+        self.version = version
+        self.esquema = list(esquema)
+        self._leer = leer
+
+    def _en_cache(self):
+        encontrado, df = cache.obtener_cache().buscar(ESPACIO_CACHE, self.nombre, version=self.version)
+        return df if encontrado else None
+
+    @property
+    def cargadas(self):
+        df = self._en_cache()
+        return [] if df is None else [columna for columna in self.esquema if columna in df.columns]
+
+    def columnas(self, columnas=None):
+        """DataFrame con ``columnas`` (todas si es ``None``), en el orden pedido.
+
+        El resultado se comparte entre sesiones: no debe modificarse.
+        """
+        columnas = list(columnas) if columnas is not None else self.esquema
+        desconocidas = [columna for columna in columnas if columna not in self.esquema]
+        if desconocidas:
+            raise KeyError(f"Columnas inexistentes en '{self.nombre}': {desconocidas}")
+
+        df = self._en_cache()
+        if df is None or not set(columnas) <= set(df.columns):
+            with _bloqueo_lectura:
+                # Otra sesión pudo leer las columnas mientras se esperaba el bloqueo
+                df = self._en_cache()
+                faltantes = [columna for columna in columnas if df is None or columna not in df.columns]
+                if faltantes:
+                    leidas = self._leer(faltantes)[faltantes]
+                    # La tabla combinada se construye solo al leer columnas nuevas
+                    df = leidas if df is None else pd.concat([df, leidas], axis=1)
+                    df = df[[columna for columna in self.esquema if columna in df.columns]]
+                    cache.obtener_cache().guardar(ESPACIO_CACHE, self.nombre, df, version=self.version)
+
+        if list(df.columns) == columnas:
+            return df
+        return df[columnas]
+
+
+def obtener_tabla(nombre):
+    """Tabla proyectada del dataset para la versión actual de su archivo.
+
+    Si el archivo cambió, las columnas leídas antes se descartan.
+    """
+    leer = functools.partial(_LECTORES[catalogo.formato(nombre)], nombre)
+    return TablaProyectada(nombre, catalogo.hash_contenido(nombre), catalogo.esquema(nombre), leer)
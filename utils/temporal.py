@@ -0,0 +1,86 @@
+"""Columnas derivadas de fechas e índices ordenados para filtrar por fecha.
+
+Los filtros por año y por rango de fechas de nacimiento usaban el accesor
+``.dt`` y comparaban contra objetos ``date`` en cada ejecución. Aquí se
+precalculan una sola vez los días desde 1970 (int64) y se construye un índice
+con el orden de las filas, de modo que una consulta por rango de fechas (o por
+año, que es el rango del 1 de enero al 31 de diciembre) se resuelve con dos
+búsquedas binarias.
+"""
+
+from datetime import date
+
+import numpy as np
+
+# Grupos de edad para el filtro por rango etario (límites inclusivos)
+GRUPOS_EDAD = {
+    "15-17": (15, 17),
+    "18-25": (18, 25),
+    "26-35": (26, 35),
+    "36-45": (36, 45),
+    "46-60": (46, 60),
+    "61+": (61, 200),
+}
+
+COLUMNAS_DERIVADAS = ["dias_epoca"]
+
+
+def a_dias(fecha):
+    """Días desde 1970-01-01 de un ``date``/``datetime``."""
+    return int(np.datetime64(fecha, "D").astype(np.int64))
+
+
+def agregar_columnas_temporales(df, columna="fecha_nacimiento"):
+    """Devuelve una copia de ``df`` con los días desde 1970 de ``columna``."""
+    df = df.copy()
+    df["dias_epoca"] = df[columna].to_numpy().astype("datetime64[D]").astype(np.int64)
+    return df
+
+
+class IndiceOrdenado:
+    """Posiciones de las filas ordenadas por un valor, para consultas por rango."""
+
+    def __init__(self, valores):
+        valores = np.asarray(valores)
+        self.filas = len(valores)
+        self.orden = np.argsort(valores, kind="stable")
+        self.ordenados = valores[self.orden]
+
+    def posiciones(self, minimo, maximo):
+        """Posiciones de las filas con ``minimo <= valor <= maximo``."""
+        inicio = np.searchsorted(self.ordenados, minimo, side="left")
+        fin = np.searchsorted(self.ordenados, maximo, side="right")
+        return self.orden[inicio:fin]
+
+    def mascara(self, minimo, maximo):
+        mascara = np.zeros(self.filas, dtype=bool)
+        mascara[self.posiciones(minimo, maximo)] = True
+        return mascara
+
+
+class IndiceTemporal:
+    """Índice por fecha (en días) de un DataFrame con columnas derivadas."""
+
+    def __init__(self, df):
+        self.por_dias = IndiceOrdenado(df["dias_epoca"].to_numpy())
+
+    def mascara_fechas(self, inicio, fin):
+        return self.por_dias.mascara(a_dias(inicio), a_dias(fin))
+
+    def mascara_anio(self, anio):
+        return self.mascara_fechas(date(anio, 1, 1), date(anio, 12, 31))
+
+
+class IndiceEdad(IndiceOrdenado):
+    """Índice por edad para el filtro por grupos de ``GRUPOS_EDAD``.
+
+    Se construye con la columna de edad que se muestra al usuario, para que
+    las filas de un grupo siempre tengan una edad visible dentro del grupo.
+    """
+
+    def mascara_grupos(self, grupos):
+        mascara = np.zeros(self.filas, dtype=bool)
+        for grupo in grupos:
+            minimo, maximo = GRUPOS_EDAD[grupo]
+            mascara[self.posiciones(minimo, maximo)] = True
+        return mascara